@@ -0,0 +1,52 @@
+"""Calculate the electronic stopping power for ion batches.
+
+Batched counterpart of the scalar estop module. Currently, only the
+Lindhard model (Phys. Rev. 124, (1961) 128) with a correction factor is
+implemented. The bulk path follows primary ions only, so the species
+index is fixed to 0.
+
+Available functions:
+    setup: setup module variables.
+    eloss: calculate the electronic energy loss.
+"""
+from math import sqrt
+import numpy as np
+
+
+def setup(corr_lindhard1, z1, m1, corr_lindhard2, z2, m2, density):
+    """Setup module variables for electronic stopping.
+
+    Parameters:
+        corr_lindhard (float): Correction factor to Lindhard stopping power
+        z1 (int): atomic number of projectile
+        m1 (float): mass of projectile (amu)
+        z2 (int): atomic number of the target atom
+        m2 (float): mass of the target atom (amu)
+        density (float): target density (atoms/A^3)
+
+    Returns:
+        None
+    """
+    global FAC_LINDHARD, DENSITY
+
+    FAC_LINDHARD = (corr_lindhard1 * 1.212 * z1**(7/6) * z2 / (
+        (z1**(2/3) + z2**(2/3))**(3/2) * sqrt(m1) ),
+        corr_lindhard2 * 1.212 * z2**(7/6) * z2 / (
+        (z2**(2/3) + z2**(2/3))**(3/2) * sqrt(m2) ))         # eV/A
+    DENSITY = density
+
+
+def eloss(e, free_path):
+    """Calculate the electronic energy loss over a given free path length.
+
+    Parameters:
+        e (ndarray): energies of the ions before the free flight path (size n)
+        free_path (float): free path length (A)
+
+    Returns:
+        (ndarray): energy losses (eV, size n)
+    """
+    dee = FAC_LINDHARD[0] * DENSITY * np.sqrt(e) * free_path
+    dee = np.minimum(dee, e)
+
+    return dee
@@ -0,0 +1,34 @@
+"""Target-geometry related operations for ion batches.
+
+Batched counterpart of the scalar geometry module. Currently, only a
+planar target geometry is supported.
+
+Available functions:
+    setup: setup module variables.
+    is_inside_target: check which positions of a batch are inside the target
+"""
+
+
+def setup(zmin, zmax):
+    """Define the geometry of the target.
+
+    Parameters:
+        zmin (float): minimum z coordinate of the target (A)
+        zmax (float): maximum z coordinate of the target (A)
+    """
+    global ZMIN, ZMAX
+
+    ZMIN = zmin
+    ZMAX = zmax
+
+
+def is_inside_target(pz):
+    """Check which positions of a batch are inside the target.
+
+    Parameters:
+        pz (ndarray): z coordinates of the positions to check (size n)
+
+    Returns:
+        (ndarray[bool]): whether each position is inside the target (size n)
+    """
+    return (ZMIN <= pz) & (pz <= ZMAX)
@@ -0,0 +1,155 @@
+"""Batched PyTRIM driver.
+
+Simulates a whole batch of primary ions at once using the vectorized
+bulk modules, or the fused Numba kernel when use_numba is set. Recoils
+are not followed in the bulk path, so only the statistics of the
+primary ions are reported.
+
+Currently, the input parameters are hardcoded in this script, as in the
+scalar driver pytrim.py.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+import numpy as np
+
+import select_recoil_bulk
+import scatter_bulk
+import estop_bulk
+import geometry
+import trajectory_bulk
+
+use_numba = True
+if use_numba:
+    import trajectory_bulk_numba
+
+use_processes = False   # fan the batch out across worker processes; only
+                        # useful on the NumPy path, where the GIL rules
+                        # out thread-level parallelism (the Numba kernel
+                        # already uses all cores via prange)
+
+dtype = np.float64      # np.float32 halves the memory traffic and
+                        # doubles the SIMD width of the position and
+                        # direction columns at reduced (but sufficient)
+                        # precision; the energies always stay float64,
+                        # as they accumulate many small loss steps
+
+
+nion = 100000           # number of projectiles to simulate
+
+zmin = 0.0              # minimum z coordinate of the target (A)
+zmax = 4000.0           # maximum z coordinate of the target (A)
+z1 = 5                  # atomic number of projectile
+m1 = 11.009             # mass of projectile (amu)
+z2 = 14                 # atomic number of target
+m2 = 28.086             # mass of target atom (amu)
+density = 0.04994       # target density (atoms/A^3)
+corr_lindhard1 = 1.5    # Correction factor to Lindhard stopping power (B->Si)
+corr_lindhard2 = 1.0    # Correction factor to Lindhard stopping power (Si->Si)
+
+e_init = 50000.0                        # initial energy (eV)
+pos_init = np.array([0.0, 0.0, 0.0])    # initial position (A)
+dir_init = np.array([0.0, 0.0, 1.0])    # initial direction (unit vector)
+
+
+def simulate(nion):
+    """Simulate the trajectories of a batch of primary ions.
+
+    Parameters:
+        nion (int): number of projectiles to simulate
+
+    Returns:
+        (ndarray, ndarray, ndarray): coordinates of the final ion
+            positions (A, size nion each)
+        (ndarray[bool]): whether each ion stopped inside the target
+            (size nion)
+    """
+    px = np.full(nion, pos_init[0], dtype=dtype)
+    py = np.full(nion, pos_init[1], dtype=dtype)
+    pz = np.full(nion, pos_init[2], dtype=dtype)
+    dx = np.full(nion, dir_init[0], dtype=dtype)
+    dy = np.full(nion, dir_init[1], dtype=dtype)
+    dz = np.full(nion, dir_init[2], dtype=dtype)
+    e = np.full(nion, e_init)   # float64 regardless of the SoA dtype
+    # uint8 flags instead of np.bool_: same storage, but bitwise mask
+    # algebra and the compiled kernels (Cython wants unsigned char)
+    # agree on the type without conversions
+    is_inside = np.ones(nion, dtype=np.uint8)
+
+    if use_numba:
+        trajectory_bulk_numba.trajectories(px, py, pz, dx, dy, dz, e,
+                                           is_inside)
+    else:
+        trajectory_bulk.trajectories(px, py, pz, dx, dy, dz, e, is_inside)
+
+    return px, py, pz, is_inside.astype(bool)
+
+
+def _worker(nion_sub, seed):
+    """Simulate a sub-batch in a worker process.
+
+    The workers are forked after the setup calls, so they inherit the
+    module constants; only the random state must be made independent
+    per process.
+    """
+    select_recoil_bulk.RNG = np.random.default_rng(seed)
+    select_recoil_bulk.TAPE = None
+    return simulate(nion_sub)
+
+
+def simulate_parallel(nion, n_jobs=None):
+    """Simulate a batch of primary ions across worker processes.
+
+    The ions are fully independent, so the batch is split into one
+    sub-batch per physical core and the results are concatenated.
+
+    Parameters:
+        nion (int): number of projectiles to simulate
+        n_jobs (int): number of worker processes (None for the core count)
+
+    Returns:
+        Same as simulate.
+    """
+    if n_jobs is None:
+        n_jobs = os.cpu_count()
+    sizes = [chunk.size for chunk in np.array_split(np.arange(nion), n_jobs)]
+    seeds = np.random.SeedSequence().generate_state(n_jobs)
+    with ProcessPoolExecutor(n_jobs, mp_context=get_context("fork")) as pool:
+        results = list(pool.map(_worker, sizes, seeds))
+
+    return tuple(np.concatenate([r[i] for r in results]) for i in range(4))
+
+
+if __name__ == "__main__":
+    # Setup modules
+    select_recoil_bulk.setup(density, nion_max=nion, dtype=dtype)
+    scatter_bulk.setup(z1, m1, z2, m2)
+    estop_bulk.setup(corr_lindhard1, z1, m1, corr_lindhard2, z2, m2, density)
+    geometry.setup(zmin, zmax)
+    trajectory_bulk.setup()
+    if use_numba:
+        trajectory_bulk_numba.setup()
+
+    start_time = time.time()
+    if use_processes and not use_numba:
+        px, py, pz, is_inside = simulate_parallel(nion)
+    else:
+        px, py, pz, is_inside = simulate(nion)
+    end_time = time.time()
+    print(f"Simulation time: {end_time - start_time:.2f} seconds")
+
+    # Output the results
+    if use_numba:
+        # one-pass parallel Welford reduction instead of a masked
+        # gather plus separate mean and std passes
+        count, mean_z, std_z = trajectory_bulk_numba.reduce_stats(
+            pz, is_inside)
+    else:
+        depths = pz[is_inside]
+        count = depths.size
+        mean_z = np.mean(depths)
+        std_z = np.std(depths)
+    print(f"Number of ions stopped inside the target: {count}")
+    print(f"Mean penetration depth: {mean_z:.2f} A")
+    print(f"Standard deviation of penetration depth: {std_z:.2f} A")
@@ -0,0 +1,119 @@
+"""Simulate the trajectories of an ion batch with vectorized NumPy.
+
+Batched counterpart of the scalar cascade module. All ions of a batch
+are advanced together, one collision step per loop iteration. Ions that
+have stopped (energy below EMIN) or left the target are excluded from
+further updates. Positions and directions are passed as separate 1D
+coordinate arrays (structure of arrays). Recoils are not followed in
+the bulk path.
+
+Available functions:
+    setup: setup module variables.
+    trajectories: simulate the trajectories of an ion batch.
+"""
+import numpy as np
+
+from select_recoil_bulk import get_recoil_position
+from scatter_bulk import scatter
+from estop_bulk import eloss
+from geometry import is_inside_target
+
+
+def setup():
+    """Setup module variables."""
+    global EMIN
+
+    EMIN = 5.0  # eV
+
+
+TILE = 8192             # ions per cache-resident tile
+COMPACT_EVERY = 16      # steps between compaction checks
+
+
+def trajectories(px, py, pz, dx, dy, dz, e, is_inside):
+    """Simulate the trajectories of an ion batch.
+
+    All arrays are updated in place and hold the final ion states on
+    return.
+
+    Parameters:
+        px, py, pz (ndarray): coordinates of the initial ion positions
+            (A, size n)
+        dx, dy, dz (ndarray): components of the initial ion directions
+            (unit vectors, size n)
+        e (ndarray): initial energies of the ions (eV, size n)
+        is_inside (ndarray[uint8]): whether each ion is inside the target
+            (size n)
+
+    Returns:
+        None
+    """
+    # Process the batch in tiles and run each tile's trajectories to
+    # completion, so the ~8 state columns of a tile stay resident in
+    # cache across all its collision steps instead of streaming the
+    # whole batch through memory once per step.
+    for start in range(0, e.shape[0], TILE):
+        sl = slice(start, start + TILE)
+        _trajectories_tile(px[sl], py[sl], pz[sl], dx[sl], dy[sl], dz[sl],
+                           e[sl], is_inside[sl])
+
+
+def _trajectories_tile(px, py, pz, dx, dy, dz, e, is_inside):
+    """Run the trajectory loop for one tile of ions in place."""
+    # Ions stay in their slots and inactive ones are masked out, so all
+    # updates are contiguous vector operations at the cost of some
+    # wasted arithmetic on finished ions. Once most ions of the tile
+    # have finished, the working arrays are periodically compacted to
+    # the active ions only (with an index table back to the caller's
+    # arrays), so the tail of the tile is not dominated by dead lanes.
+    caller = (px, py, pz, dx, dy, dz, e, is_inside)
+    orig_ions = None    # None while still working on the caller's arrays
+    nstep = 0
+    active = (e > EMIN) & is_inside
+    while active.any():
+        nstep += 1
+        free_path, p, dirpx, dirpy, dirpz = get_recoil_position(
+            px, py, pz, dx, dy, dz)
+        dee = eloss(e, free_path)
+        e -= np.where(active, dee, 0.0)
+        px += np.where(active, free_path * dx, 0.0)
+        py += np.where(active, free_path * dy, 0.0)
+        pz += np.where(active, free_path * dz, 0.0)
+        is_inside &= is_inside_target(pz)
+
+        # Scatter, but keep the pre-collision state for ions that have
+        # left the target, as the scalar trajectory stops before
+        # scattering in that case.
+        update = active & is_inside
+        e_new, dx_new, dy_new, dz_new, rdx, rdy, rdz, recoil_e = scatter(
+            np.maximum(e, EMIN), dx, dy, dz, p, dirpx, dirpy, dirpz)
+        e[:] = np.where(update, e_new, e)
+        dx[:] = np.where(update, dx_new, dx)
+        dy[:] = np.where(update, dy_new, dy)
+        dz[:] = np.where(update, dz_new, dz)
+
+        active = (e > EMIN) & is_inside
+
+        if nstep % COMPACT_EVERY == 0 and 2 * int(active.sum()) < active.size:
+            idx = np.flatnonzero(active)
+            if orig_ions is None:
+                orig_ions = idx
+            else:
+                # flush the finished ions' final state before shrinking
+                for dst, src in zip(caller,
+                                    (px, py, pz, dx, dy, dz, e, is_inside)):
+                    dst[orig_ions] = src
+                orig_ions = orig_ions[idx]
+            px = px[idx]
+            py = py[idx]
+            pz = pz[idx]
+            dx = dx[idx]
+            dy = dy[idx]
+            dz = dz[idx]
+            e = e[idx]
+            is_inside = is_inside[idx]
+            active = np.ones(idx.size, dtype=np.uint8)
+
+    if orig_ions is not None:
+        for dst, src in zip(caller, (px, py, pz, dx, dy, dz, e, is_inside)):
+            dst[orig_ions] = src
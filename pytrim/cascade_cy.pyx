@@ -0,0 +1,271 @@
+# cython: boundscheck=False, wraparound=False, cdivision=True
+# cython: language_level=3
+"""Simulate projectile trajectories in a compiled Cython extension.
+
+Compiled counterpart of the cascade module for primary ions. The whole
+collision step (recoil selection, electronic energy loss, geometry
+test, and ZBL scattering) is inlined into a single C loop per ion with
+typed scalar locals, and the ions of a batch are distributed over
+OpenMP threads with prange. Random numbers come from a per-ion
+xorshift64* generator so the loop can run without the GIL. Recoils are
+not followed.
+
+Build with:
+    python setup_cascade_cy.py build_ext --inplace
+
+Available functions:
+    setup: setup module variables.
+    trajectory_batch: simulate the trajectories of an ion batch.
+"""
+from libc.math cimport sqrt, exp, sin, cos, fabs, M_PI
+from cython.parallel cimport prange
+
+
+# Module state, set by setup()
+cdef double EMIN, ZMIN, ZMAX, MEAN_FREE_PATH, PMAX
+cdef double FAC_LINDHARD, DENSITY
+cdef double ENORM, RNORM, DIRFAC, DENFAC
+
+# Constants for ZBL screening function (see scatter)
+cdef double A1 = 0.18175
+cdef double A2 = 0.50986
+cdef double A3 = 0.28022
+cdef double A4 = 0.02817
+
+cdef double B1 = 3.1998
+cdef double B2 = 0.94229
+cdef double B3 = 0.4029
+cdef double B4 = 0.20162
+
+cdef double A1B1 = A1 * B1
+cdef double A2B2 = A2 * B2
+cdef double A3B3 = A3 * B3
+cdef double A4B4 = A4 * B4
+
+# Constants for apsis estimation for the ZBL potential (see scatter)
+cdef double K2 = 0.38
+cdef double K3 = 7.2
+cdef double K1 = 1/(4*K2)
+cdef double R12sq = (2*K2)**2
+cdef double R23sq = K3 / K2
+cdef int NITER = 1
+
+# Constants for the magic formula (see scatter)
+cdef double C1 = 0.99229
+cdef double C2 = 0.011615
+cdef double C3 = 0.007122
+cdef double C4 = 14.813
+cdef double C5 = 9.3066
+
+
+def setup(emin, zmin, zmax, mean_free_path, pmax, fac_lindhard, density,
+          enorm, rnorm, dirfac, denfac):
+    """Setup module variables.
+
+    The values correspond to the module variables of the cascade,
+    geometry, select_recoil, estop, and scatter modules for the primary
+    ion species.
+
+    Parameters:
+        emin (float): cutoff energy of the trajectories (eV)
+        zmin (float): minimum z coordinate of the target (A)
+        zmax (float): maximum z coordinate of the target (A)
+        mean_free_path (float): free path length between collisions (A)
+        pmax (float): maximum impact parameter (A)
+        fac_lindhard (float): Lindhard stopping factor of the ions (eV/A)
+        density (float): target density (atoms/A^3)
+        enorm (float): energy normalization of the ZBL potential (eV)
+        rnorm (float): length normalization of the ZBL potential (A)
+        dirfac (float): kinematic direction factor of the ions
+        denfac (float): kinematic energy-transfer factor of the ions
+    """
+    global EMIN, ZMIN, ZMAX, MEAN_FREE_PATH, PMAX, FAC_LINDHARD, DENSITY
+    global ENORM, RNORM, DIRFAC, DENFAC
+
+    EMIN = emin
+    ZMIN = zmin
+    ZMAX = zmax
+    MEAN_FREE_PATH = mean_free_path
+    PMAX = pmax
+    FAC_LINDHARD = fac_lindhard
+    DENSITY = density
+    ENORM = enorm
+    RNORM = rnorm
+    DIRFAC = dirfac
+    DENFAC = denfac
+
+
+cdef inline double _rand_uniform(unsigned long long* state) noexcept nogil:
+    """xorshift64* uniform random number in [0, 1)."""
+    cdef unsigned long long x = state[0]
+    x ^= x >> 12
+    x ^= x << 25
+    x ^= x >> 27
+    state[0] = x
+    return ((x * 2685821657736338717ULL) >> 11) * (1.0 / 9007199254740992.0)
+
+
+cdef inline double _zbl_screen(double r, double* dscreen) noexcept nogil:
+    """ZBL screening function; the derivative is returned via dscreen."""
+    cdef double exp1 = exp(-B1 * r)
+    cdef double exp2 = exp(-B2 * r)
+    cdef double exp3 = exp(-B3 * r)
+    cdef double exp4 = exp(-B4 * r)
+    dscreen[0] = - (A1B1*exp1 + A2B2*exp2 + A3B3*exp3 + A4B4*exp4)
+    return A1*exp1 + A2*exp2 + A3*exp3 + A4*exp4
+
+
+cdef double _magic(double e, double p) noexcept nogil:
+    """CM scattering angle from Biersack's magic formula."""
+    cdef double psq = p*p
+    cdef double r0sq, r0, screen, dscreen
+    cdef double numerator, denominator, residuum
+    cdef double rho, sqrte, alpha, beta, gamma, a, g, delta
+    cdef int it
+
+    r0sq = 0.5 * (psq + sqrt(psq*psq + 4*K3/e))
+    if r0sq < R23sq:
+        r0sq = psq + K2/e
+        if r0sq < R12sq:
+            r0 = (1 + sqrt(1 + 4*e*(e+K1)*psq)) / (2*(e+K1))
+        else:
+            r0 = sqrt(r0sq)
+    else:
+        r0 = sqrt(r0sq)
+
+    for it in range(NITER):
+        screen = _zbl_screen(r0, &dscreen)
+        numerator = r0*(r0-screen/e) - psq
+        denominator = 2*r0 - (screen+r0*dscreen)/e
+        r0 -= numerator/denominator
+
+        residuum = 1 - screen/(e*r0) - psq/(r0*r0)
+        if fabs(residuum) < 1e-4:
+            break
+
+    screen = _zbl_screen(r0, &dscreen)
+    rho = 2*(e*r0-screen) / (screen/r0-dscreen)
+    sqrte = sqrt(e)
+    alpha = 1 + C1/sqrte
+    beta = (C2+sqrte) / (C3+sqrte)
+    gamma = (C4+e) / (C5+e)
+    a = 2 * alpha * e * p**beta
+    g = gamma / (sqrt(1+a*a)-a)
+    delta = a * (r0-p) / (1+g)
+
+    return (p + rho + delta) / (r0 + rho)
+
+
+cdef void _trajectory_one(double* px, double* py, double* pz,
+                          double* dx, double* dy, double* dz,
+                          double* e, unsigned char* inside,
+                          unsigned long long* rng) noexcept nogil:
+    """Run the collision loop of a single ion with scalar locals."""
+    cdef double p, fi, cos_fi, sin_fi
+    cdef double adx, ady, adz, dk, di, dj
+    cdef double cos_alpha, sin_alpha, cos_phi, sin_phi
+    cdef double dpi, dpj, dpk, dirpx, dirpy, dirpz, norm
+    cdef double dee, cos_half_theta, sin_psi, cos_psi
+    cdef double rdx, rdy, rdz, nx, ny, nz, recoil_e
+
+    while e[0] > EMIN and inside[0]:
+        # recoil selection (see select_recoil.get_recoil_position)
+        p = PMAX * sqrt(_rand_uniform(rng))
+        fi = 2 * M_PI * _rand_uniform(rng)
+        cos_fi = cos(fi)
+        sin_fi = sin(fi)
+
+        adx = fabs(dx[0])
+        ady = fabs(dy[0])
+        adz = fabs(dz[0])
+        if adx <= ady and adx <= adz:
+            dk = dx[0]; di = dy[0]; dj = dz[0]
+        elif ady <= adz:
+            dk = dy[0]; di = dz[0]; dj = dx[0]
+        else:
+            dk = dz[0]; di = dx[0]; dj = dy[0]
+        cos_alpha = dk
+        sin_alpha = sqrt(di*di + dj*dj)
+        cos_phi = di / sin_alpha
+        sin_phi = dj / sin_alpha
+
+        dpi = cos_fi*cos_alpha*cos_phi - sin_fi*sin_phi
+        dpj = cos_fi*cos_alpha*sin_phi + sin_fi*cos_phi
+        dpk = - cos_fi*sin_alpha
+        norm = sqrt(dpi*dpi + dpj*dpj + dpk*dpk)
+        dpi /= norm
+        dpj /= norm
+        dpk /= norm
+        if adx <= ady and adx <= adz:
+            dirpx = dpk; dirpy = dpi; dirpz = dpj
+        elif ady <= adz:
+            dirpx = dpj; dirpy = dpk; dirpz = dpi
+        else:
+            dirpx = dpi; dirpy = dpj; dirpz = dpk
+
+        # electronic energy loss (see estop.eloss)
+        dee = FAC_LINDHARD * DENSITY * sqrt(e[0]) * MEAN_FREE_PATH
+        if dee > e[0]:
+            dee = e[0]
+        e[0] -= dee
+
+        # free flight to the collision point
+        px[0] += MEAN_FREE_PATH * dx[0]
+        py[0] += MEAN_FREE_PATH * dy[0]
+        pz[0] += MEAN_FREE_PATH * dz[0]
+        if not (ZMIN <= pz[0] <= ZMAX):
+            inside[0] = 0
+            break
+
+        # scattering (see scatter.scatter)
+        cos_half_theta = _magic(e[0]/ENORM, p/RNORM)
+        sin_psi = cos_half_theta
+        cos_psi = sqrt(1 - sin_psi*sin_psi)
+        rdx = DIRFAC * cos_psi * (cos_psi*dx[0] + sin_psi*dirpx)
+        rdy = DIRFAC * cos_psi * (cos_psi*dy[0] + sin_psi*dirpy)
+        rdz = DIRFAC * cos_psi * (cos_psi*dz[0] + sin_psi*dirpz)
+        nx = dx[0] - rdx
+        ny = dy[0] - rdy
+        nz = dz[0] - rdz
+        norm = sqrt(nx*nx + ny*ny + nz*nz)
+        if norm > 0:
+            dx[0] = nx / norm
+            dy[0] = ny / norm
+            dz[0] = nz / norm
+
+        recoil_e = DENFAC * e[0] * (1 - cos_half_theta*cos_half_theta)
+        e[0] -= recoil_e
+
+
+def trajectory_batch(double[::1] px, double[::1] py, double[::1] pz,
+                     double[::1] dx, double[::1] dy, double[::1] dz,
+                     double[::1] e, unsigned char[::1] is_inside,
+                     unsigned long long seed=1234567):
+    """Simulate the trajectories of an ion batch.
+
+    All arrays are updated in place and hold the final ion states on
+    return. The ions are distributed over OpenMP threads.
+
+    Parameters:
+        px, py, pz (ndarray): coordinates of the initial ion positions
+            (A, size n)
+        dx, dy, dz (ndarray): components of the initial ion directions
+            (unit vectors, size n)
+        e (ndarray): initial energies of the ions (eV, size n)
+        is_inside (ndarray[uint8]): whether each ion is inside the
+            target (size n)
+        seed (int): seed of the per-ion random number generators
+
+    Returns:
+        None
+    """
+    cdef Py_ssize_t n = e.shape[0]
+    cdef Py_ssize_t i
+    cdef unsigned long long rng
+
+    with nogil:
+        for i in prange(n):
+            rng = seed + 0x9E3779B97F4A7C15ULL * (<unsigned long long>i + 1)
+            _trajectory_one(&px[i], &py[i], &pz[i],
+                            &dx[i], &dy[i], &dz[i],
+                            &e[i], &is_inside[i], &rng)
@@ -0,0 +1,82 @@
+"""CUDA PyTRIM driver.
+
+Simulates a whole batch of primary ions on the GPU with one CUDA
+thread per ion, using the kernel in trajectory_cuda. Recoils are not
+followed, so only the statistics of the primary ions are reported.
+
+The physics constants come from the bulk modules in pytrim/bulk, so
+run with both this directory and pytrim/bulk on the path. Currently,
+the input parameters are hardcoded in this script, as in the other
+drivers.
+"""
+import time
+import numpy as np
+
+import select_recoil_bulk
+import scatter_bulk
+import estop_bulk
+import geometry
+import trajectory_cuda
+
+
+nion = 100000           # number of projectiles to simulate
+
+zmin = 0.0              # minimum z coordinate of the target (A)
+zmax = 4000.0           # maximum z coordinate of the target (A)
+z1 = 5                  # atomic number of projectile
+m1 = 11.009             # mass of projectile (amu)
+z2 = 14                 # atomic number of target
+m2 = 28.086             # mass of target atom (amu)
+density = 0.04994       # target density (atoms/A^3)
+corr_lindhard1 = 1.5    # Correction factor to Lindhard stopping power (B->Si)
+corr_lindhard2 = 1.0    # Correction factor to Lindhard stopping power (Si->Si)
+
+e_init = 50000.0                        # initial energy (eV)
+pos_init = np.array([0.0, 0.0, 0.0])    # initial position (A)
+dir_init = np.array([0.0, 0.0, 1.0])    # initial direction (unit vector)
+
+
+def simulate(nion):
+    """Simulate the trajectories of a batch of primary ions on the GPU.
+
+    Parameters:
+        nion (int): number of projectiles to simulate
+
+    Returns:
+        (ndarray, ndarray, ndarray): coordinates of the final ion
+            positions (A, size nion each)
+        (ndarray[bool]): whether each ion stopped inside the target
+            (size nion)
+    """
+    px = np.full(nion, pos_init[0])
+    py = np.full(nion, pos_init[1])
+    pz = np.full(nion, pos_init[2])
+    dx = np.full(nion, dir_init[0])
+    dy = np.full(nion, dir_init[1])
+    dz = np.full(nion, dir_init[2])
+    e = np.full(nion, e_init)
+    is_inside = np.ones(nion, dtype=np.uint8)
+
+    trajectory_cuda.trajectories(px, py, pz, dx, dy, dz, e, is_inside)
+
+    return px, py, pz, is_inside.astype(bool)
+
+
+if __name__ == "__main__":
+    # Setup modules
+    select_recoil_bulk.setup(density)
+    scatter_bulk.setup(z1, m1, z2, m2)
+    estop_bulk.setup(corr_lindhard1, z1, m1, corr_lindhard2, z2, m2, density)
+    geometry.setup(zmin, zmax)
+    trajectory_cuda.setup()
+
+    start_time = time.time()
+    px, py, pz, is_inside = simulate(nion)
+    end_time = time.time()
+    print(f"Simulation time: {end_time - start_time:.2f} seconds")
+
+    # Output the results
+    depths = pz[is_inside]
+    print(f"Number of ions stopped inside the target: {depths.size}")
+    print(f"Mean penetration depth: {np.mean(depths):.2f} A")
+    print(f"Standard deviation of penetration depth: {np.std(depths):.2f} A")
@@ -0,0 +1,258 @@
+"""Simulate the trajectories of an ion batch on the GPU with Numba CUDA.
+
+Drop-in replacement for trajectory_bulk.trajectories with one ion per
+CUDA thread. Each thread runs its ion's whole collision loop with the
+state held in registers, using the xoroshiro128+ per-thread random
+number generator shipped with Numba. The state arrays are transferred
+to the device once per batch and back once at the end. Recoils are not
+followed in the bulk path.
+
+The physics constants are read from the bulk modules in pytrim/bulk,
+whose setup functions must have been called before. Run from this
+directory with pytrim/bulk on the path, as the bulk driver does.
+
+Available functions:
+    setup: setup module variables.
+    trajectories: simulate the trajectories of an ion batch.
+"""
+from math import sqrt, exp, sin, cos, pi
+import numpy as np
+from numba import cuda
+from numba.cuda.random import (create_xoroshiro128p_states,
+                               xoroshiro128p_uniform_float64)
+
+import select_recoil_bulk
+import scatter_bulk
+import estop_bulk
+import geometry
+import trajectory_bulk
+
+THREADS_PER_BLOCK = 256
+
+
+def setup(seed=None):
+    """Setup module variables.
+
+    Parameters:
+        seed (int): seed for the per-thread random number generators
+            (None for a random seed)
+    """
+    global EMIN, SEED
+
+    trajectory_bulk.setup()
+    EMIN = trajectory_bulk.EMIN
+    SEED = seed if seed is not None else np.random.randint(2**31)
+
+
+# Constants for ZBL screening function (see scatter_bulk)
+A1 = 0.18175
+A2 = 0.50986
+A3 = 0.28022
+A4 = 0.02817
+
+B1 = 3.1998
+B2 = 0.94229
+B3 = 0.4029
+B4 = 0.20162
+
+A1B1 = A1 * B1
+A2B2 = A2 * B2
+A3B3 = A3 * B3
+A4B4 = A4 * B4
+
+# Constants for apsis estimation for the ZBL potential (see scatter_bulk)
+K2 = 0.38
+K3 = 7.2
+K1 = 1/(4*K2)
+R12sq = (2*K2)**2
+R23sq = K3 / K2
+
+# Constants for the magic formula (see scatter_bulk)
+C1 = 0.99229
+C2 = 0.011615
+C3 = 0.007122
+C4 = 14.813
+C5 = 9.3066
+
+
+@cuda.jit(device=True, fastmath=True)
+def _zbl_screen(r):
+    """ZBL screening function and its derivative (device scalar)."""
+    exp1 = exp(-B1 * r)
+    exp2 = exp(-B2 * r)
+    exp3 = exp(-B3 * r)
+    exp4 = exp(-B4 * r)
+    screen = A1*exp1 + A2*exp2 + A3*exp3 + A4*exp4
+    dscreen = - (A1B1*exp1 + A2B2*exp2 + A3B3*exp3 + A4B4*exp4)
+
+    return screen, dscreen
+
+
+@cuda.jit(device=True, fastmath=True)
+def _magic(e, p):
+    """CM scattering angle from Biersack's magic formula (device scalar)."""
+    psq = p**2
+    r0sq = 0.5 * (psq + sqrt(psq**2 + 4*K3/e))
+
+    if r0sq < R23sq:
+        r0sq = psq + K2/e
+        if r0sq < R12sq:
+            r0 = (1 + sqrt(1 + 4*e*(e+K1)*psq)) / (2*(e+K1))
+        else:
+            r0 = sqrt(r0sq)
+    else:
+        r0 = sqrt(r0sq)
+
+    # two Newton-Raphson refinements, unrolled into straight-line code
+    screen, dscreen = _zbl_screen(r0)
+    r0 -= (r0*(r0-screen/e) - psq) / (2*r0 - (screen+r0*dscreen)/e)
+    screen, dscreen = _zbl_screen(r0)
+    r0 -= (r0*(r0-screen/e) - psq) / (2*r0 - (screen+r0*dscreen)/e)
+
+    screen, dscreen = _zbl_screen(r0)
+    rho = 2*(e*r0-screen) / (screen/r0-dscreen)
+    sqrte = sqrt(e)
+    alpha = 1 + C1/sqrte
+    beta = (C2+sqrte) / (C3+sqrte)
+    gamma = (C4+e) / (C5+e)
+    a = 2 * alpha * e * p**beta
+    g = gamma / (sqrt(1+a**2)-a)
+    delta = a * (r0-p) / (1+g)
+
+    return (p + rho + delta) / (r0 + rho)
+
+
+@cuda.jit(fastmath=True)
+def trajectories_kernel(pxa, pya, pza, dxa, dya, dza, e, is_inside,
+                        rng_states, emin, zmin, zmax,
+                        mean_free_path, pmax, fac_lindhard, density,
+                        enorm, rnorm, dirfac, denfac):
+    """Run the full trajectory loop, one ion per thread."""
+    ion = cuda.grid(1)
+    if ion >= e.shape[0]:
+        return
+
+    px = pxa[ion]
+    py = pya[ion]
+    pz = pza[ion]
+    dx = dxa[ion]
+    dy = dya[ion]
+    dz = dza[ion]
+    ei = e[ion]
+    inside = is_inside[ion] != 0
+
+    while ei > emin and inside:
+        # recoil selection (see select_recoil_bulk.get_recoil_position)
+        p = pmax * sqrt(xoroshiro128p_uniform_float64(rng_states, ion))
+        fi = 2 * pi * xoroshiro128p_uniform_float64(rng_states, ion)
+        cos_fi = cos(fi)
+        sin_fi = sin(fi)
+
+        adx = abs(dx)
+        ady = abs(dy)
+        adz = abs(dz)
+        if adx <= ady and adx <= adz:
+            dk, di, dj = dx, dy, dz
+        elif ady <= adz:
+            dk, di, dj = dy, dz, dx
+        else:
+            dk, di, dj = dz, dx, dy
+        cos_alpha = dk
+        sin_alpha = sqrt(di**2 + dj**2)
+        cos_phi = di / sin_alpha
+        sin_phi = dj / sin_alpha
+
+        dpi = cos_fi*cos_alpha*cos_phi - sin_fi*sin_phi
+        dpj = cos_fi*cos_alpha*sin_phi + sin_fi*cos_phi
+        dpk = - cos_fi*sin_alpha
+        norm = sqrt(dpi**2 + dpj**2 + dpk**2)
+        dpi /= norm
+        dpj /= norm
+        dpk /= norm
+        if adx <= ady and adx <= adz:
+            dirpx, dirpy, dirpz = dpk, dpi, dpj
+        elif ady <= adz:
+            dirpx, dirpy, dirpz = dpj, dpk, dpi
+        else:
+            dirpx, dirpy, dirpz = dpi, dpj, dpk
+
+        # electronic energy loss (see estop_bulk.eloss)
+        dee = fac_lindhard * density * sqrt(ei) * mean_free_path
+        if dee > ei:
+            dee = ei
+        ei -= dee
+
+        # free flight to the collision point
+        px += mean_free_path * dx
+        py += mean_free_path * dy
+        pz += mean_free_path * dz
+        if not (zmin <= pz <= zmax):
+            inside = False
+            break
+
+        # scattering (see scatter_bulk.scatter)
+        cos_half_theta = _magic(ei/enorm, p/rnorm)
+        sin_psi = cos_half_theta
+        cos_psi = sqrt(1 - sin_psi**2)
+        rdx = dirfac * cos_psi * (cos_psi*dx + sin_psi*dirpx)
+        rdy = dirfac * cos_psi * (cos_psi*dy + sin_psi*dirpy)
+        rdz = dirfac * cos_psi * (cos_psi*dz + sin_psi*dirpz)
+        nx = dx - rdx
+        ny = dy - rdy
+        nz = dz - rdz
+        norm = sqrt(nx**2 + ny**2 + nz**2)
+        if norm > 0:
+            dx = nx / norm
+            dy = ny / norm
+            dz = nz / norm
+
+        recoil_e = denfac * ei * (1 - cos_half_theta**2)
+        ei -= recoil_e
+
+    pxa[ion] = px
+    pya[ion] = py
+    pza[ion] = pz
+    dxa[ion] = dx
+    dya[ion] = dy
+    dza[ion] = dz
+    e[ion] = ei
+    is_inside[ion] = inside
+
+
+def trajectories(px, py, pz, dx, dy, dz, e, is_inside):
+    """Simulate the trajectories of an ion batch on the GPU.
+
+    Thin wrapper around trajectories_kernel that moves the state arrays
+    to the device, launches one thread per ion, and copies the final
+    states back. All arrays are updated in place.
+
+    Parameters:
+        px, py, pz (ndarray): coordinates of the initial ion positions
+            (A, size n)
+        dx, dy, dz (ndarray): components of the initial ion directions
+            (unit vectors, size n)
+        e (ndarray): initial energies of the ions (eV, size n)
+        is_inside (ndarray[bool]): whether each ion is inside the target
+            (size n)
+
+    Returns:
+        None
+    """
+    nion = e.shape[0]
+    blocks = (nion + THREADS_PER_BLOCK - 1) // THREADS_PER_BLOCK
+    rng_states = create_xoroshiro128p_states(nion, seed=SEED)
+
+    d_arrays = [cuda.to_device(a) for a in (px, py, pz, dx, dy, dz, e,
+                                            is_inside)]
+    trajectories_kernel[blocks, THREADS_PER_BLOCK](
+        *d_arrays, rng_states,
+        EMIN,
+        geometry.ZMIN, geometry.ZMAX,
+        select_recoil_bulk.MEAN_FREE_PATH,
+        select_recoil_bulk.PMAX,
+        estop_bulk.FAC_LINDHARD[0], estop_bulk.DENSITY,
+        scatter_bulk.ENORM[0], scatter_bulk.RNORM[0],
+        scatter_bulk.DIRFAC[0], scatter_bulk.DENFAC[0])
+
+    for host, dev in zip((px, py, pz, dx, dy, dz, e, is_inside), d_arrays):
+        dev.copy_to_host(host)
@@ -10,6 +10,11 @@ class Projectile:
         dir (ndarray): direction (unit vector, size 3)
         ispec (int): atom species index
         is_inside (bool): whether the projectile is inside the target"""
+    # slots instead of a per-instance dict: attribute loads in the
+    # collision loop become fixed-offset reads, and cascades of spawned
+    # recoils allocate less
+    __slots__ = ("e", "pos", "dir", "ispec", "is_inside")
+
     def __init__(self, e, pos, dir, ispec=0, is_inside=True):
         self.e = e
         self.pos = pos
@@ -0,0 +1,219 @@
+"""Simulate ion batches with a fused @guvectorize step ufunc.
+
+Alternative to the prange kernel in pytrim/bulk/trajectory_bulk_numba:
+the whole collision step (recoil selection, electronic energy loss,
+geometry test, and ZBL scattering) is a single generalized ufunc that
+maps one length-8 state row (px, py, pz, dx, dy, dz, e, is_inside) to
+the post-step row. Numba parallelizes the ufunc over the ions of the
+batch, all intermediates live in registers, and the Python driver loop
+only checks for termination. Recoils are not followed.
+
+The physics constants are read from the bulk modules in pytrim/bulk,
+whose setup functions must have been called before. Run with
+pytrim/bulk on the path, as the bulk driver does.
+
+Available functions:
+    setup: setup module variables.
+    trajectories: simulate the trajectories of an ion batch.
+"""
+from math import sqrt, exp, sin, cos, pi
+import numpy as np
+from numba import guvectorize, float64
+
+import select_recoil_bulk
+import scatter_bulk
+import estop_bulk
+import geometry
+import trajectory_bulk
+from trajectory_bulk_numba import _magic as _magic_scalar
+
+
+def setup():
+    """Setup module variables.
+
+    The physics constants are collected from the bulk modules, whose
+    setup functions must have been called before, into the constants
+    row passed to the step ufunc.
+    """
+    global EMIN, CONSTS, RNG
+
+    RNG = np.random.default_rng()
+    trajectory_bulk.setup()
+    EMIN = trajectory_bulk.EMIN
+    CONSTS = np.array([
+        EMIN,
+        geometry.ZMIN, geometry.ZMAX,
+        select_recoil_bulk.MEAN_FREE_PATH,
+        select_recoil_bulk.PMAX,
+        estop_bulk.FAC_LINDHARD[0], estop_bulk.DENSITY,
+        scatter_bulk.ENORM[0], scatter_bulk.RNORM[0],
+        scatter_bulk.DIRFAC[0], scatter_bulk.DENFAC[0],
+    ])
+
+
+TAPE_BUDGET = 1 << 24   # max uniform samples held in the random tape
+TILE = 8192             # ions per cache-resident tile (see trajectory_bulk)
+
+
+@guvectorize([(float64[:], float64[:], float64[:], float64[:])],
+             '(s),(c),(r)->(s)',
+             nopython=True, target='parallel', fastmath=True, cache=True)
+def step(state, consts, rnd, out):
+    """Advance one ion state row by one collision step.
+
+    rnd holds the two uniform deviates of the step. They are drawn in
+    bulk outside the ufunc: Numba's built-in generator is a single
+    shared Mersenne Twister state, which serializes the parallel lanes
+    and draws scalar samples, while the caller's bit generator fills
+    the whole batch in one vectorized request.
+    """
+    emin = consts[0]
+    zmin = consts[1]
+    zmax = consts[2]
+    mean_free_path = consts[3]
+    pmax = consts[4]
+    fac_lindhard = consts[5]
+    density = consts[6]
+    enorm = consts[7]
+    rnorm = consts[8]
+    dirfac = consts[9]
+    denfac = consts[10]
+
+    px = state[0]
+    py = state[1]
+    pz = state[2]
+    dx = state[3]
+    dy = state[4]
+    dz = state[5]
+    ei = state[6]
+    inside = state[7] != 0.0
+
+    if ei > emin and inside:
+        # recoil selection (see select_recoil_bulk.get_recoil_position)
+        p = pmax * sqrt(rnd[0])
+        fi = 2 * pi * rnd[1]
+        cos_fi = cos(fi)
+        sin_fi = sin(fi)
+
+        adx = abs(dx)
+        ady = abs(dy)
+        adz = abs(dz)
+        if adx <= ady and adx <= adz:
+            dk, di, dj = dx, dy, dz
+        elif ady <= adz:
+            dk, di, dj = dy, dz, dx
+        else:
+            dk, di, dj = dz, dx, dy
+        cos_alpha = dk
+        sin_alpha = sqrt(di**2 + dj**2)
+        cos_phi = di / sin_alpha
+        sin_phi = dj / sin_alpha
+
+        # unit length by construction, no normalization needed
+        dpi = cos_fi*cos_alpha*cos_phi - sin_fi*sin_phi
+        dpj = cos_fi*cos_alpha*sin_phi + sin_fi*cos_phi
+        dpk = - cos_fi*sin_alpha
+        if adx <= ady and adx <= adz:
+            dirpx, dirpy, dirpz = dpk, dpi, dpj
+        elif ady <= adz:
+            dirpx, dirpy, dirpz = dpj, dpk, dpi
+        else:
+            dirpx, dirpy, dirpz = dpi, dpj, dpk
+
+        # electronic energy loss (see estop_bulk.eloss)
+        dee = fac_lindhard * density * sqrt(ei) * mean_free_path
+        if dee > ei:
+            dee = ei
+        ei -= dee
+
+        # free flight to the collision point
+        px += mean_free_path * dx
+        py += mean_free_path * dy
+        pz += mean_free_path * dz
+        if not (zmin <= pz <= zmax):
+            inside = False
+        else:
+            # scattering (see scatter_bulk.scatter)
+            cos_half_theta = _magic_scalar(ei/enorm, p/rnorm)
+            sin_psi = cos_half_theta
+            cos_psi = sqrt(1 - sin_psi**2)
+            rdx = dirfac * cos_psi * (cos_psi*dx + sin_psi*dirpx)
+            rdy = dirfac * cos_psi * (cos_psi*dy + sin_psi*dirpy)
+            rdz = dirfac * cos_psi * (cos_psi*dz + sin_psi*dirpz)
+            nx = dx - rdx
+            ny = dy - rdy
+            nz = dz - rdz
+            norm = sqrt(nx**2 + ny**2 + nz**2)
+            if norm > 0:
+                dx = nx / norm
+                dy = ny / norm
+                dz = nz / norm
+
+            recoil_e = denfac * ei * (1 - cos_half_theta**2)
+            ei -= recoil_e
+
+    out[0] = px
+    out[1] = py
+    out[2] = pz
+    out[3] = dx
+    out[4] = dy
+    out[5] = dz
+    out[6] = ei
+    out[7] = 1.0 if inside else 0.0
+
+
+def _advance_tile(state):
+    """Apply the step ufunc to one tile of state rows until all finish.
+
+    The uniform deviates come from a pre-generated random tape, as in
+    select_recoil_bulk: one large vectorized draw serves many steps,
+    capped by TAPE_BUDGET.
+    """
+    n = state.shape[0]
+    tape = None
+    tape_step = 0
+    while np.any((state[:,6] > EMIN) & (state[:,7] != 0.0)):
+        if tape is None or tape_step >= tape.shape[0]:
+            est_steps = max(1, min(1024, TAPE_BUDGET // (2 * n)))
+            tape = RNG.random((est_steps, n, 2))
+            tape_step = 0
+        step(state, CONSTS, tape[tape_step], out=state)
+        tape_step += 1
+
+
+def trajectories(px, py, pz, dx, dy, dz, e, is_inside):
+    """Simulate the trajectories of an ion batch with the step ufunc.
+
+    The SoA columns are packed into an (n,8) state array once, the
+    fused step ufunc is applied until all ions have finished, and the
+    final states are unpacked back into the columns in place.
+
+    Parameters:
+        px, py, pz (ndarray): coordinates of the initial ion positions
+            (A, size n)
+        dx, dy, dz (ndarray): components of the initial ion directions
+            (unit vectors, size n)
+        e (ndarray): initial energies of the ions (eV, size n)
+        is_inside (ndarray[bool]): whether each ion is inside the target
+            (size n)
+
+    Returns:
+        None
+    """
+    state = np.stack([px, py, pz, dx, dy, dz, e,
+                      is_inside.astype(np.float64)], axis=1)
+
+    # Run each tile of state rows to completion so the tile stays
+    # cache-resident across all its collision steps instead of
+    # streaming the whole batch through memory once per step.
+    for start in range(0, e.shape[0], TILE):
+        _advance_tile(state[start:start + TILE])
+
+    px[:] = state[:,0]
+    py[:] = state[:,1]
+    pz[:] = state[:,2]
+    dx[:] = state[:,3]
+    dy[:] = state[:,4]
+    dz[:] = state[:,5]
+    e[:] = state[:,6]
+    is_inside[:] = state[:,7] != 0.0
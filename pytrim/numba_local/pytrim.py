@@ -0,0 +1,222 @@
+"""Per-ion Numba PyTRIM driver.
+
+Keeps the structure of the scalar driver pytrim.py — simulate follows
+one trajectory per ion — but the per-ion trajectory is a jitted
+function and the ion loop is a prange, so the whole simulation runs
+inside compiled code without a Python-to-native transition per ion and
+scales across cores. Per-ion results are written into preallocated
+arrays instead of Python lists. Recoils are not followed.
+
+The physics constants are read from the bulk modules in pytrim/bulk,
+whose setup functions must have been called before. Run with
+pytrim/bulk on the path, as the bulk driver does.
+
+Available functions:
+    setup: setup module variables.
+    simulate: simulate the trajectories of a batch of primary ions.
+"""
+import time
+from math import sqrt, sin, cos
+import numpy as np
+from numba import njit, prange
+
+import select_recoil_bulk
+import scatter_bulk
+import estop_bulk
+import geometry
+import trajectory_bulk
+from trajectory_bulk_numba import _pcg32, _magic
+
+
+def setup(seed=None):
+    """Setup module variables.
+
+    The physics constants are read from the bulk modules, whose setup
+    functions must have been called before.
+
+    Parameters:
+        seed (int): seed for the per-ion random number generators
+            (None for a random seed)
+    """
+    global EMIN, SEED
+
+    trajectory_bulk.setup()
+    EMIN = trajectory_bulk.EMIN
+    SEED = seed if seed is not None else np.random.randint(2**62)
+
+
+@njit(cache=True, fastmath=True, inline='always')
+def _trajectory(px, py, pz, dx, dy, dz, ei, rng,
+                emin, zmin, zmax, mean_free_path, pmax,
+                fac_lindhard, density, enorm, rnorm, dirfac, denfac):
+    """Follow one ion trajectory with the state in scalar locals.
+
+    Returns the final state (px, py, pz, dx, dy, dz, e, is_inside, rng).
+    """
+    inside = True
+    while ei > emin and inside:
+        # recoil selection (see select_recoil_bulk.get_recoil_position)
+        rng, u = _pcg32(rng)
+        p = pmax * sqrt(u)
+        rng, u = _pcg32(rng)
+        fi = 2 * np.pi * u
+        cos_fi = cos(fi)
+        sin_fi = sin(fi)
+
+        adx = abs(dx)
+        ady = abs(dy)
+        adz = abs(dz)
+        if adx <= ady and adx <= adz:
+            dk, di, dj = dx, dy, dz
+        elif ady <= adz:
+            dk, di, dj = dy, dz, dx
+        else:
+            dk, di, dj = dz, dx, dy
+        cos_alpha = dk
+        sin_alpha = sqrt(di**2 + dj**2)
+        cos_phi = di / sin_alpha
+        sin_phi = dj / sin_alpha
+
+        # unit length by construction, no normalization needed
+        dpi = cos_fi*cos_alpha*cos_phi - sin_fi*sin_phi
+        dpj = cos_fi*cos_alpha*sin_phi + sin_fi*cos_phi
+        dpk = - cos_fi*sin_alpha
+        if adx <= ady and adx <= adz:
+            dirpx, dirpy, dirpz = dpk, dpi, dpj
+        elif ady <= adz:
+            dirpx, dirpy, dirpz = dpj, dpk, dpi
+        else:
+            dirpx, dirpy, dirpz = dpi, dpj, dpk
+
+        # electronic energy loss (see estop_bulk.eloss)
+        dee = fac_lindhard * density * sqrt(ei) * mean_free_path
+        if dee > ei:
+            dee = ei
+        ei -= dee
+
+        # free flight to the collision point
+        px += mean_free_path * dx
+        py += mean_free_path * dy
+        pz += mean_free_path * dz
+        if not (zmin <= pz <= zmax):
+            inside = False
+            break
+
+        # scattering (see scatter_bulk.scatter)
+        cos_half_theta = _magic(ei/enorm, p/rnorm)
+        sin_psi = cos_half_theta
+        cos_psi = sqrt(1 - sin_psi**2)
+        rdx = dirfac * cos_psi * (cos_psi*dx + sin_psi*dirpx)
+        rdy = dirfac * cos_psi * (cos_psi*dy + sin_psi*dirpy)
+        rdz = dirfac * cos_psi * (cos_psi*dz + sin_psi*dirpz)
+        nx = dx - rdx
+        ny = dy - rdy
+        nz = dz - rdz
+        norm = sqrt(nx**2 + ny**2 + nz**2)
+        if norm > 0:
+            dx = nx / norm
+            dy = ny / norm
+            dz = nz / norm
+
+        recoil_e = denfac * ei * (1 - cos_half_theta**2)
+        ei -= recoil_e
+
+    return px, py, pz, dx, dy, dz, ei, inside, rng
+
+
+@njit(cache=True, fastmath=True, parallel=True)
+def _simulate_kernel(pxa, pya, pza, dxa, dya, dza, e, is_inside,
+                     rng_states, emin, zmin, zmax,
+                     mean_free_path, pmax, fac_lindhard, density,
+                     enorm, rnorm, dirfac, denfac):
+    """Follow all ion trajectories, one prange lane per ion."""
+    for ion in prange(e.shape[0]):
+        px, py, pz, dx, dy, dz, ei, inside, rng = _trajectory(
+            pxa[ion], pya[ion], pza[ion],
+            dxa[ion], dya[ion], dza[ion],
+            e[ion], rng_states[ion],
+            emin, zmin, zmax, mean_free_path, pmax,
+            fac_lindhard, density, enorm, rnorm, dirfac, denfac)
+        pxa[ion] = px
+        pya[ion] = py
+        pza[ion] = pz
+        dxa[ion] = dx
+        dya[ion] = dy
+        dza[ion] = dz
+        e[ion] = ei
+        is_inside[ion] = inside
+        rng_states[ion] = rng
+
+
+def simulate(nion):
+    """Simulate the trajectories of a batch of primary ions.
+
+    Parameters:
+        nion (int): number of projectiles to simulate
+
+    Returns:
+        (ndarray, ndarray, ndarray): coordinates of the final ion
+            positions (A, size nion each)
+        (ndarray[bool]): whether each ion stopped inside the target
+            (size nion)
+    """
+    px = np.full(nion, pos_init[0])
+    py = np.full(nion, pos_init[1])
+    pz = np.full(nion, pos_init[2])
+    dx = np.full(nion, dir_init[0])
+    dy = np.full(nion, dir_init[1])
+    dz = np.full(nion, dir_init[2])
+    e = np.full(nion, e_init)
+    is_inside = np.ones(nion, dtype=np.uint8)
+
+    ion = np.arange(1, nion + 1, dtype=np.uint64)
+    rng_states = (np.uint64(SEED)
+                  + ion * np.uint64(0x9E3779B97F4A7C15)) | np.uint64(1)
+
+    _simulate_kernel(px, py, pz, dx, dy, dz, e, is_inside, rng_states,
+                     EMIN,
+                     geometry.ZMIN, geometry.ZMAX,
+                     select_recoil_bulk.MEAN_FREE_PATH,
+                     select_recoil_bulk.PMAX,
+                     estop_bulk.FAC_LINDHARD[0], estop_bulk.DENSITY,
+                     scatter_bulk.ENORM[0], scatter_bulk.RNORM[0],
+                     scatter_bulk.DIRFAC[0], scatter_bulk.DENFAC[0])
+
+    return px, py, pz, is_inside.astype(bool)
+
+
+nion = 100000           # number of projectiles to simulate
+
+zmin = 0.0              # minimum z coordinate of the target (A)
+zmax = 4000.0           # maximum z coordinate of the target (A)
+z1 = 5                  # atomic number of projectile
+m1 = 11.009             # mass of projectile (amu)
+z2 = 14                 # atomic number of target
+m2 = 28.086             # mass of target atom (amu)
+density = 0.04994       # target density (atoms/A^3)
+corr_lindhard1 = 1.5    # Correction factor to Lindhard stopping power (B->Si)
+corr_lindhard2 = 1.0    # Correction factor to Lindhard stopping power (Si->Si)
+
+e_init = 50000.0                        # initial energy (eV)
+pos_init = np.array([0.0, 0.0, 0.0])    # initial position (A)
+dir_init = np.array([0.0, 0.0, 1.0])    # initial direction (unit vector)
+
+
+if __name__ == "__main__":
+    # Setup modules
+    select_recoil_bulk.setup(density)
+    scatter_bulk.setup(z1, m1, z2, m2)
+    estop_bulk.setup(corr_lindhard1, z1, m1, corr_lindhard2, z2, m2, density)
+    geometry.setup(zmin, zmax)
+    setup()
+
+    start_time = time.time()
+    px, py, pz, is_inside = simulate(nion)
+    end_time = time.time()
+    print(f"Simulation time: {end_time - start_time:.2f} seconds")
+
+    # Output the results
+    depths = pz[is_inside]
+    print(f"Number of ions stopped inside the target: {depths.size}")
+    print(f"Mean penetration depth: {np.mean(depths):.2f} A")
+    print(f"Standard deviation of penetration depth: {np.std(depths):.2f} A")
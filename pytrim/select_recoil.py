@@ -8,7 +8,8 @@ Available functions:
     setup: setup module variables.
     get_recoil_position: get the recoil position.
 """
-from math import sqrt, sin, cos
+from math import sqrt
+from cmath import exp as cexp
 import numpy as np
 
 
@@ -21,10 +22,20 @@ def setup(density):
     Returns:
         None    
     """
-    global PMAX, MEAN_FREE_PATH
+    global PMAX, MEAN_FREE_PATH, RNG, _RND_BUF, _RND_POS
 
     MEAN_FREE_PATH = density**(-1/3)
     PMAX = MEAN_FREE_PATH / sqrt(np.pi)
+    # PCG64 generator instead of the legacy global RandomState, as in
+    # the bulk recoil selection; refills write into the existing buffer
+    RNG = np.random.default_rng()
+    _RND_BUF = np.empty(2 * _RND_BATCH)
+    RNG.random(out=_RND_BUF)
+    _RND_POS = 0
+
+
+_RND_BATCH = 4096   # uniform pairs drawn per batch; a single bulk draw
+                    # replaces thousands of per-call generator dispatches
 
 
 def get_recoil_position(pos, dir):
@@ -41,20 +52,35 @@ def get_recoil_position(pos, dir):
         (ndarray): direction vector from collision point to recoil (size 3)
         (ndarray): position of the recoil (A, size 3)
     """
+    global _RND_POS
+
     free_path = MEAN_FREE_PATH
-    collision_pos = pos[:] + free_path * dir[:]
 
-    p = PMAX * sqrt(np.random.rand())
+    if _RND_POS >= _RND_BUF.size:
+        RNG.random(out=_RND_BUF)
+        _RND_POS = 0
+    p = PMAX * sqrt(_RND_BUF[_RND_POS])
     # Azimuthal angle fi
-    fi = 2 * np.pi * np.random.rand()
-    cos_fi = cos(fi)
-    sin_fi = sin(fi)
+    fi = 2 * np.pi * _RND_BUF[_RND_POS + 1]
+    _RND_POS += 2
+    # one complex exp yields both the cosine (real part) and the sine
+    # (imaginary part), as in the bulk recoil selection
+    cs = cexp(1j * fi)
+    cos_fi = cs.real
+    sin_fi = cs.imag
 
     # Convert direction vector to polar angles
-    # make k point to the smallest dir(:) so sinalf > sqrt(2/3)
-    k = np.argmin(np.abs(dir[:]))
-    i = (k + 1) % 3
-    j = (i + 1) % 3
+    # make k point to the smallest dir(:) so sinalf > sqrt(2/3);
+    # three scalar compares instead of np.argmin plus modulo arithmetic
+    a0 = abs(dir[0])
+    a1 = abs(dir[1])
+    a2 = abs(dir[2])
+    if a0 <= a1 and a0 <= a2:
+        i, j, k = 1, 2, 0
+    elif a1 <= a2:
+        i, j, k = 2, 0, 1
+    else:
+        i, j, k = 0, 1, 2
     cos_alpha = dir[k]
     sin_alpha = sqrt( dir[i]**2 + dir[j]**2 )
     cos_phi = dir[i] / sin_alpha
@@ -65,10 +91,13 @@ def get_recoil_position(pos, dir):
     dirp[i] = cos_fi*cos_alpha*cos_phi - sin_fi*sin_phi
     dirp[j] = cos_fi*cos_alpha*sin_phi + sin_fi*cos_phi
     dirp[k] = - cos_fi*sin_alpha
-    norm = np.linalg.norm(dirp)
-    dirp /= norm
+    # dirp is composed from an orthonormal basis, so |dirp| = 1 up to
+    # roundoff and no normalization is needed (same as in the bulk path)
 
-    # position of the recoil
-    recoil_pos = collision_pos[:] + p * dirp[:]
+    # position of the recoil, composed in scalars so the collision
+    # point is never materialized as an intermediate array
+    recoil_pos = np.array((pos[0] + free_path*dir[0] + p*dirp[0],
+                           pos[1] + free_path*dir[1] + p*dirp[1],
+                           pos[2] + free_path*dir[2] + p*dirp[2]))
 
-    return free_path, p, dirp[:], recoil_pos[:]
+    return free_path, p, dirp, recoil_pos
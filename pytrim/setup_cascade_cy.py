@@ -0,0 +1,21 @@
+"""Build script for the cascade_cy Cython extension.
+
+Usage:
+    python setup_cascade_cy.py build_ext --inplace
+"""
+from setuptools import Extension, setup
+from Cython.Build import cythonize
+
+extensions = [
+    Extension(
+        "cascade_cy",
+        ["cascade_cy.pyx"],
+        extra_compile_args=["-O3", "-fopenmp"],
+        extra_link_args=["-fopenmp"],
+    ),
+]
+
+setup(
+    name="cascade_cy",
+    ext_modules=cythonize(extensions),
+)
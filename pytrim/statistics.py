@@ -33,37 +33,46 @@ class Moment_1d:
     Attributes:
         nvar (int): number of variables for which moments are desired
         nmax (int): maximum order of moments
-        count (ndarray[int]): number of scored data points per variable (size 
+        count (ndarray[int]): number of scored data points per variable (size
             nvar)
-        _orders (ndarray[int]): orders of all moments to be calculated (size 
-            2*nmax+1)
-        _mom (ndarray[float]): sum of values raised to the order of the moment 
+        _mom (ndarray[float]): sum of values raised to the order of the moment
             to be calculated (shape (nvar, 2*nmax+1))
         _cenmom (ndarray[float]): central moments (shape (nvar, 2*nmax+1))
+        _binom (ndarray[float]): binomial coefficient table (shape
+            (2*nmax+1, 2*nmax+1))
     """
     def __init__(self, nvar, nmax):
         self.nvar = nvar
         if nmax < 1 or nmax > 4:
             raise ValueError("nmax must be between 1 and 4.")
         self.nmax = nmax
-        self._orders = np.arange(0, 2*nmax + 1, dtype=int)
         self._mom = np.zeros((nvar, 2*nmax + 1), dtype=float)
+        self._binom = np.array([[math.comb(i, j) for j in range(2*nmax + 1)]
+                                for i in range(2*nmax + 1)], dtype=float)
 
     def score(self, ivar, value):
         """Score a new data point for variable ivar."""
-        self._mom[ivar,:] += value**self._orders[:]
+        # running product instead of a broadcast power: no temporary
+        # array and no pow dispatch per scored point
+        mom = self._mom[ivar]
+        mom[0] += 1.0
+        power = 1.0
+        for k in range(1, mom.shape[0]):
+            power *= value
+            mom[k] += power
 
     def central_moments(self):
         """Compute central moments up to order 2*nmax."""
         self.count = self._mom[:,0]
         mom = self._mom[:,:] / self.count[:,np.newaxis]
         self._cenmom = np.zeros_like(self._mom)
+        # cenmom[i] = sum_j C(i,j) * mom[i-j] * (-mean)^j, with the
+        # binomial table precomputed and the j sum done as a dot product
         for ivar in range(self.nvar):
+            signs = (-mom[ivar,1])**np.arange(2*self.nmax + 1)
             for i in range(2*self.nmax + 1):
-                self._cenmom[ivar,i] = mom[ivar,i]
-                for j in range(1, i+1):
-                    self._cenmom[ivar,i] += (math.comb(i, j) 
-                            * mom[ivar,i-j] * (-mom[ivar,1])**j)
+                self._cenmom[ivar,i] = np.dot(
+                    self._binom[i,:i+1] * signs[:i+1], mom[ivar,i::-1])
 
     def mean(self):
         """Return the mean values and their standard errors."""
@@ -104,34 +113,60 @@ class Histogram_1d:
 
     To calculate histograms, create an instance of this class with the
     desired number of variables, number of bins, and limits. Score data points
-    using the score() method. The histogram counts can be accessed via the 
+    using the score() method. Call finalize() after all data points have
+    been scored; the histogram counts can then be accessed via the
     'counts' attribute.
-    
+
     Attributes:
         nvar (int): number variables for which histograms are desired
         nbin (int): number of bins
         limits (tuple[float]): (min, max) limits of the histogram (size 2)
-        counts (ndarray[int]): counts per bin including 
+        counts (ndarray[int]): counts per bin including
             underflow and overflow bins (shape (nvar,nbin+2))
         bin_width (float): width of each bin
+        _pending (list[list[float]]): buffered values not yet binned
     """
+
+    _FLUSH = 65536      # buffered values per variable before a flush
+
     def __init__(self, nvar, nbin, limits):
         self.nvar = nvar
         self.nbin = nbin
         self.limits = limits
         self.bin_width = (self.limits[1] - self.limits[0]) / self.nbin
+        self._inv_bin_width = 1.0 / self.bin_width
         self.counts = np.zeros((nvar, nbin+2), dtype=int)
+        self._pending = [[] for _ in range(nvar)]
 
     def score(self, ivar, value):
-        """Score a new data point to the histogram of variable ivar."""
-        if value < self.limits[0]:
-            ibin = 0                # underflow bin
-        elif value >= self.limits[1]:
-            ibin = -1               # overflow bin
-        else:
-            ibin = int((value - self.limits[0]) / self.bin_width) + 1
-        
-        self.counts[ivar,ibin] += 1
+        """Score a new data point to the histogram of variable ivar.
+
+        The value is only buffered; the binning happens vectorized over
+        whole batches when the buffer fills up and in finalize().
+        """
+        pending = self._pending[ivar]
+        pending.append(value)
+        if len(pending) >= self._FLUSH:
+            self._flush(ivar)
+
+    def finalize(self):
+        """Bin all buffered values into the counts."""
+        for ivar in range(self.nvar):
+            self._flush(ivar)
+
+    def _flush(self, ivar):
+        """Bin and count the buffered values of variable ivar."""
+        pending = self._pending[ivar]
+        if not pending:
+            return
+        values = np.asarray(pending)
+        # multiply by the precomputed reciprocal instead of dividing
+        ibin = ((values - self.limits[0])
+                * self._inv_bin_width).astype(np.int64) + 1
+        ibin[values < self.limits[0]] = 0               # underflow bin
+        ibin[values >= self.limits[1]] = self.nbin + 1  # overflow bin
+        self.counts[ivar] += np.bincount(ibin, minlength=self.nbin+2)
+        pending.clear()
 
 
 def setup(nspec, nbin, limits):
@@ -194,6 +229,7 @@ def plot_results(log=False):
     """Plot the histogram using matplotlib."""
     import matplotlib.pyplot as plt
 
+    hist.finalize()
     for ivar in range(hist.nvar):
         plt.stairs(hist.counts[ivar,1:-1],
                    edges=np.linspace(hist.limits[0], hist.limits[1], 
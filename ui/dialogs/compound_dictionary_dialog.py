@@ -1,16 +1,38 @@
 from __future__ import annotations
 
+import copy
+import functools
 import html
 import json
 import os
 import re
 import shutil
-from collections import defaultdict
+
+try:
+    # optional fast C parser; stdlib json is the drop-in fallback
+    import orjson as _json
+except ImportError:
+    _json = json
+from itertools import groupby
 from pathlib import Path
 from typing import Any, Optional, Union
 
-from PyQt6.QtCore import Qt, pyqtSignal, QSize, QRectF, QPointF
-from PyQt6.QtGui import QIcon, QPainter, QPixmap, QColor, QPen, QBrush
+from PyQt6.QtCore import (
+    Qt,
+    pyqtSignal,
+    QSize,
+    QRectF,
+    QPointF,
+    QAbstractTableModel,
+    QModelIndex,
+    QMutex,
+    QMutexLocker,
+    QRunnable,
+    QSignalBlocker,
+    QThreadPool,
+    QTimer,
+)
+from PyQt6.QtGui import QIcon, QPainter, QPixmap, QPixmapCache, QColor, QPen, QBrush
 from PyQt6.QtWidgets import (
     QDialog,
     QVBoxLayout,
@@ -26,8 +48,7 @@ from PyQt6.QtWidgets import (
     QPushButton,
     QLineEdit,
     QDoubleSpinBox,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QHeaderView,
     QMessageBox,
     QToolButton,
@@ -40,6 +61,262 @@ from PyQt6.QtWidgets import (
 from app.ui.widgets.periodic_table_picker import PeriodicTableDialog
 
 
+@functools.lru_cache(maxsize=1)
+def _load_element_densities_cached() -> tuple[Optional[float], ...]:
+    """
+    Reads periodicTableJson from app/ui/widgets and returns a tuple
+    indexed by Z holding density_g_cm3 (or None where unknown).
+
+    Z is a small dense integer, so a tuple lookup replaces hashing and
+    probing a dict on the hot recompute path. Cached at module level so
+    all edit-dialog instances share one parse instead of re-reading the
+    JSON file on every dialog open.
+    """
+    densities: list[Optional[float]] = [None] * 119
+
+    widgets_dir = Path(__file__).resolve().parents[1] / "widgets"
+    candidates = [
+        widgets_dir / "periodicTableJson.json",
+        widgets_dir / "periodic_table_json.json",
+        widgets_dir / "periodicTable.json",
+    ]
+    path = next((p for p in candidates if p.exists()), None)
+    if path is None:
+        return tuple(densities)
+
+    try:
+        # parse the raw bytes; this skips a Python-level decode pass
+        data = _json.loads(path.read_bytes())
+    except Exception:
+        return tuple(densities)
+
+    # Support either {"elements":[...]} or just [...]
+    elements = data.get("elements") if isinstance(data, dict) else data
+    if not isinstance(elements, list):
+        return tuple(densities)
+
+    for el in elements:
+        if not isinstance(el, dict):
+            continue
+        try:
+            z = int(el.get("number"))
+        except (TypeError, ValueError):
+            continue
+        dens = el.get("density")
+        if dens is None or not (0 < z < 119):
+            continue
+        try:
+            densities[z] = float(dens)
+        except (TypeError, ValueError):
+            continue
+    return tuple(densities)
+
+
+def _invalidate_density_cache():
+    """Drop the cached element densities (e.g. after the JSON changed)."""
+    _load_element_densities_cached.cache_clear()
+
+
+@functools.lru_cache(maxsize=64)
+def _theme_icon_from_names(names: tuple[str, ...]) -> Optional[QIcon]:
+    """First available theme icon for the given names, or None.
+
+    Theme lookups walk the icon-theme search path; caching by the name
+    tuple avoids repeating them for every dialog construction.
+    """
+    for n in names:
+        ico = QIcon.fromTheme(n)
+        if not ico.isNull():
+            return ico
+    return None
+
+
+# Precompiled once; the tolerant-JSON fallback runs these over the whole file.
+_RE_LINE_COMMENT = re.compile(r"(?m)^\s*//.*?$")
+_RE_BLOCK_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_RE_TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+_RE_Z_FALLBACK = re.compile(r"Z=\s*(\d+)")
+
+# memoized escape for the small recurring strings (names, sections, kv
+# entries) rendered into the info panel
+_escape = functools.lru_cache(maxsize=4096)(html.escape)
+
+
+def _strip_json_comments_and_fix(s: str) -> str:
+    # remove // comments
+    s = _RE_LINE_COMMENT.sub("", s)
+    # remove /* ... */ comments
+    s = _RE_BLOCK_COMMENT.sub("", s)
+    # replace unicode ellipsis placeholders like {…} with {}
+    s = s.replace("{…}", "{}").replace("…", "null")
+    # remove trailing commas before } or ]
+    s = _RE_TRAILING_COMMA.sub(r"\1", s)
+    return s
+
+
+@functools.lru_cache(maxsize=8)
+def _load_compounds_cached(path_str: str, mtime_ns: int, size: int) -> list:
+    """
+    Parse a compounds JSON file, tolerating comments and trailing commas.
+
+    Keyed on (path, mtime, size) so reopening the dialog skips the
+    re-parse while external edits to the file still invalidate the entry.
+    May raise; the caller reports load errors to the user.
+    """
+    path = Path(path_str)
+    try:
+        raw = _json.loads(path.read_bytes())
+    except Exception:
+        # fallback: tolerate comments / trailing commas / {…}
+        txt = _strip_json_comments_and_fix(path.read_text(encoding="utf-8"))
+        raw = _json.loads(txt)
+    return raw if isinstance(raw, list) else []
+
+
+class _CompositionModel(QAbstractTableModel):
+    """
+    Table model for composition rows. Each row holds [Z, label, fraction
+    text]; the Z is carried as plain Python data instead of per-cell
+    QTableWidgetItems, and edits only touch the changed row.
+
+    The fraction sum and density-weighted sum are maintained
+    incrementally: every mutation subtracts the old contribution of the
+    touched row and adds the new one, so recomputing the density is O(1)
+    per edit instead of a full-table scan.
+    """
+
+    _HEADERS = ("Element", "fraction")
+
+    def __init__(self, z_density: tuple[Optional[float], ...], parent=None):
+        super().__init__(parent)
+        self._z_density = z_density
+        self._rows: list[list[Any]] = []
+        self.sum_frac = 0.0
+        self.sum_weighted = 0.0
+
+    def _contribution(self, row: list[Any]) -> tuple[float, float]:
+        """Return (fraction, fraction*density) of a row, or zeros if the
+        row has no valid Z, fraction, or known density."""
+        z, _label, f_text = row
+        if z is None:
+            return 0.0, 0.0
+        try:
+            fr = float((f_text or "").strip())
+        except ValueError:
+            return 0.0, 0.0
+        dens = self._z_density[z] if 0 < z < len(self._z_density) else None
+        if dens is None:
+            return 0.0, 0.0
+        return fr, fr * dens
+
+    # --- Qt model interface ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 2
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return row[1] if index.column() == 0 else row[2]
+        if role == Qt.ItemDataRole.UserRole and index.column() == 0:
+            return row[0]
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid():
+            return False
+        row = self._rows[index.row()]
+        old_fr, old_weighted = self._contribution(row)
+        if role == Qt.ItemDataRole.UserRole and index.column() == 0:
+            row[0] = value
+        elif role == Qt.ItemDataRole.EditRole:
+            row[1 if index.column() == 0 else 2] = str(value)
+        else:
+            return False
+        new_fr, new_weighted = self._contribution(row)
+        self.sum_frac += new_fr - old_fr
+        self.sum_weighted += new_weighted - old_weighted
+        self.dataChanged.emit(index, index)
+        return True
+
+    def flags(self, index):
+        return (Qt.ItemFlag.ItemIsSelectable
+                | Qt.ItemFlag.ItemIsEnabled
+                | Qt.ItemFlag.ItemIsEditable)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if (role == Qt.ItemDataRole.DisplayRole
+                and orientation == Qt.Orientation.Horizontal):
+            return self._HEADERS[section]
+        return None
+
+    # --- convenience API used by the edit dialog ---
+
+    @staticmethod
+    def _make_row(z: Any, fraction: Any) -> list[Any]:
+        label = ""
+        if z is not None:
+            try:
+                z = int(z)
+                label = f"Z={z}"
+            except (TypeError, ValueError):
+                label = str(z)
+                z = None
+        return [z, label, "" if fraction in (None, "") else str(fraction)]
+
+    def append_row(self, z: Any, fraction: Any):
+        new_row = self._make_row(z, fraction)
+        r = len(self._rows)
+        self.beginInsertRows(QModelIndex(), r, r)
+        self._rows.append(new_row)
+        self.endInsertRows()
+        fr, weighted = self._contribution(new_row)
+        self.sum_frac += fr
+        self.sum_weighted += weighted
+
+    def load_rows(self, parts: list[tuple[Any, Any]]):
+        """Bulk-append (z, fraction) pairs with one insert notification,
+        so loading a many-constituent compound lays out the view once."""
+        new_rows = [self._make_row(z, fr) for z, fr in parts]
+        if not new_rows:
+            return
+        r = len(self._rows)
+        self.beginInsertRows(QModelIndex(), r, r + len(new_rows) - 1)
+        self._rows.extend(new_rows)
+        self.endInsertRows()
+        for row in new_rows:
+            fr, weighted = self._contribution(row)
+            self.sum_frac += fr
+            self.sum_weighted += weighted
+
+    def remove_rows(self, rows: list[int]):
+        for r in sorted(set(rows), reverse=True):
+            fr, weighted = self._contribution(self._rows[r])
+            self.beginRemoveRows(QModelIndex(), r, r)
+            del self._rows[r]
+            self.endRemoveRows()
+            self.sum_frac -= fr
+            self.sum_weighted -= weighted
+
+    def set_element(self, row: int, z: int, label: str):
+        old_fr, old_weighted = self._contribution(self._rows[row])
+        self._rows[row][0] = z
+        self._rows[row][1] = label
+        new_fr, new_weighted = self._contribution(self._rows[row])
+        self.sum_frac += new_fr - old_fr
+        self.sum_weighted += new_weighted - old_weighted
+        index = self.index(row, 0)
+        self.dataChanged.emit(index, index)
+
+    def rows(self) -> list[list[Any]]:
+        return self._rows
+
+
 class _CompoundEditDialog(QDialog):
     """
     Small editor for one compound. Kept intentionally simple:
@@ -106,20 +383,21 @@ class _CompoundEditDialog(QDialog):
 
         self.btn_add_section.clicked.connect(self._add_section)
 
-        # composition table
+        # composition table (model/view: no per-cell item widgets)
         root.addWidget(QLabel("Composition (Element / fraction)"))
-        self.tbl = QTableWidget(0, 2)
-        self.tbl.setHorizontalHeaderLabels(["Element", "fraction"])
+        self._z_density = _load_element_densities_cached()
+        self._model = _CompositionModel(self._z_density, self)
+        self.tbl = QTableView()
+        self.tbl.setModel(self._model)
         self.tbl.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.tbl.verticalHeader().setVisible(False)
         root.addWidget(self.tbl)
 
-        for part in (self._initial.get("composition") or []):
-            if not isinstance(part, dict):
-                continue
-            z = part.get("Z")
-            fr = part.get("fraction")
-            self._append_row(z, fr)
+        self._model.load_rows([
+            (part.get("Z"), part.get("fraction"))
+            for part in (self._initial.get("composition") or [])
+            if isinstance(part, dict)
+        ])
 
         # row controls: only plus and trash
         row_btns = QHBoxLayout()
@@ -168,12 +446,15 @@ class _CompoundEditDialog(QDialog):
         self.btn_cancel.clicked.connect(self.reject)
         self.btn_ok.clicked.connect(self.accept)
 
-        self._z_density = self._load_element_densities()
-        self._suppress_tbl_signals = False
+        # one picker instance per editor, built on first use and reused
+        # for every element pick (it parses the periodic-table JSON and
+        # builds ~118 buttons on construction)
+        self._element_picker: Optional[PeriodicTableDialog] = None
+        self._element_picker_slot = None
 
         # composition table
-        self.tbl.cellChanged.connect(self._on_tbl_changed)
-        self.tbl.cellDoubleClicked.connect(self._on_tbl_cell_double_clicked)
+        self._model.dataChanged.connect(self._on_tbl_changed)
+        self.tbl.doubleClicked.connect(self._on_tbl_double_clicked)
         self._recompute_density()
 
     def _theme_icon(self, theme_name: str, fallback: QStyle.StandardPixmap) -> QIcon:
@@ -183,10 +464,9 @@ class _CompoundEditDialog(QDialog):
         return self.style().standardIcon(fallback)
 
     def _theme_icon_multi(self, theme_names: list[str], fallback: QStyle.StandardPixmap) -> QIcon:
-        for name in theme_names:
-            ico = QIcon.fromTheme(name)
-            if not ico.isNull():
-                return ico
+        ico = _theme_icon_from_names(tuple(theme_names))
+        if ico is not None:
+            return ico
         return self.style().standardIcon(fallback)
 
     def _add_section(self):
@@ -200,120 +480,43 @@ class _CompoundEditDialog(QDialog):
             self.cb_section.addItem(s)
         self.cb_section.setCurrentText(s)
 
-    def _load_element_densities(self) -> dict[int, float]:
-        """
-        Reads periodicTableJson from app/ui/widgets and returns {Z: density_g_cm3}.
-        """
-        widgets_dir = Path(__file__).resolve().parents[1] / "widgets"
-        candidates = [
-            widgets_dir / "periodicTableJson.json",
-            widgets_dir / "periodic_table_json.json",
-            widgets_dir / "periodicTable.json",
-        ]
-        path = next((p for p in candidates if p.exists()), None)
-        if path is None:
-            return {}
-
-        try:
-            data = json.loads(path.read_text(encoding="utf-8"))
-        except Exception:
-            return {}
-
-        # Support either {"elements":[...]} or just [...]
-        elements = data.get("elements") if isinstance(data, dict) else data
-        if not isinstance(elements, list):
-            return {}
-
-        out: dict[int, float] = {}
-        for el in elements:
-            if not isinstance(el, dict):
-                continue
-            try:
-                z = int(el.get("number"))
-            except (TypeError, ValueError):
-                continue
-            dens = el.get("density")
-            if dens is None:
-                continue
-            try:
-                out[z] = float(dens)
-            except (TypeError, ValueError):
-                continue
-        return out
-
-    def _on_tbl_changed(self, _row: int, _col: int):
-        if self._suppress_tbl_signals:
-            return
+    def _on_tbl_changed(self, _top_left, _bottom_right, _roles=None):
         self._recompute_density()
 
     def _recompute_density(self):
-        # Weighted average using entered fractions, normalized by sum(fraction).
-        total = 0.0
-        weighted = 0.0
-
-        for r in range(self.tbl.rowCount()):
-            z_item = self.tbl.item(r, 0)
-            f_item = self.tbl.item(r, 1)
-            if not z_item or not f_item:
-                continue
-
-            z = z_item.data(Qt.ItemDataRole.UserRole)
-            try:
-                z = int(z) if z is not None else None
-            except (TypeError, ValueError):
-                z = None
-            if z is None:
-                continue
-
-            try:
-                fr = float((f_item.text() or "").strip())
-            except ValueError:
-                continue
-
-            dens = self._z_density.get(z)
-            if dens is None:
-                continue
-
-            total += fr
-            weighted += fr * dens
-
+        # Weighted average using entered fractions, normalized by
+        # sum(fraction); both sums are maintained by the model.
+        total = self._model.sum_frac
         if total <= 0.0:
             return
+        weighted = self._model.sum_weighted
 
-        self._suppress_tbl_signals = True
-        try:
+        # block at the Qt level: the valueChanged signal is never
+        # emitted for this programmatic update
+        with QSignalBlocker(self.sp_density):
             self.sp_density.setValue(weighted / total)
-        finally:
-            self._suppress_tbl_signals = False
 
     def _append_row(self, z: Any, fraction: Any):
-        r = self.tbl.rowCount()
-        self.tbl.insertRow(r)
-
-        elem_item = QTableWidgetItem("")
-        if z is not None:
-            try:
-                z_int = int(z)
-                elem_item.setData(Qt.ItemDataRole.UserRole, z_int)
-                elem_item.setText(f"Z={z_int}")
-            except (TypeError, ValueError):
-                elem_item.setText(str(z))
-
-        self.tbl.setItem(r, 0, elem_item)
-        self.tbl.setItem(r, 1, QTableWidgetItem("" if fraction is None else str(fraction)))
+        self._model.append_row(z, fraction)
 
     def _add_row_and_pick_element(self):
         self._append_row(None, "")
-        row = self.tbl.rowCount() - 1
-        self.tbl.setCurrentCell(row, 0)
+        row = self._model.rowCount() - 1
+        self.tbl.setCurrentIndex(self._model.index(row, 0))
         self._pick_element_for_row(row)
 
     def _pick_element_for_row(self, row=None):
         if row is None:
-            row = self.tbl.currentRow()
+            row = self.tbl.currentIndex().row()
             if row < 0:
                 return
-        dlg = PeriodicTableDialog(self, compact=True, show_hover_info=True, bordered=True)
+        if self._element_picker is None:
+            self._element_picker = PeriodicTableDialog(
+                self, compact=True, show_hover_info=True, bordered=True)
+        elif self._element_picker_slot is not None:
+            # retarget the reused dialog at the current row
+            self._element_picker.element_selected.disconnect(
+                self._element_picker_slot)
 
         def _apply(element: dict):
             try:
@@ -325,18 +528,12 @@ class _CompoundEditDialog(QDialog):
             txt = f"{symbol} (Z={z})" if symbol else f"Z={z}"
             if name:
                 txt = f"{txt} — {name}"
+            # emits dataChanged, which triggers _recompute_density
+            self._model.set_element(row, z, txt)
 
-            it = self.tbl.item(row, 0)
-            if it is None:
-                it = QTableWidgetItem()
-                self.tbl.setItem(row, 0, it)  # only insert if not present (prevents ownership errors)
-
-            it.setData(Qt.ItemDataRole.UserRole, z)
-            it.setText(txt)
-            self._recompute_density()
-
-        dlg.element_selected.connect(_apply)
-        dlg.exec()
+        self._element_picker_slot = _apply
+        self._element_picker.element_selected.connect(_apply)
+        self._element_picker.exec()
 
     def result_compound(self) -> dict:
         name_display = self.ed_name.text().strip()
@@ -344,25 +541,16 @@ class _CompoundEditDialog(QDialog):
         density = float(self.sp_density.value())
 
         composition: list[dict] = []
-        for r in range(self.tbl.rowCount()):
-            z_item = self.tbl.item(r, 0)
-            f_item = self.tbl.item(r, 1)
-            if not z_item or not f_item:
-                continue
+        for z, label, f_text in self._model.rows():
             try:
-                fr = float(f_item.text().strip())
+                fr = float((f_text or "").strip())
             except ValueError:
                 continue
 
-            z = z_item.data(Qt.ItemDataRole.UserRole)
             if z is None:
-                # fallback: try to parse "Z=.." from text
-                txt = (z_item.text() or "").strip()
-                if "Z=" in txt:
-                    try:
-                        z = int(txt.split("Z=", 1)[1].split(")", 1)[0].strip())
-                    except ValueError:
-                        z = None
+                # fallback: try to parse "Z=.." from the label
+                m = _RE_Z_FALLBACK.search(label or "")
+                z = int(m.group(1)) if m else None
             try:
                 z = int(z) if z is not None else None
             except (TypeError, ValueError):
@@ -382,36 +570,60 @@ class _CompoundEditDialog(QDialog):
         return base
 
     def _delete_selected_rows(self):
-        rows = sorted({i.row() for i in self.tbl.selectedIndexes()}, reverse=True)
-        for r in rows:
-            self.tbl.removeRow(r)
+        rows = [i.row() for i in self.tbl.selectedIndexes()]
+        self._model.remove_rows(rows)
         self._recompute_density()
 
-    def _on_tbl_cell_double_clicked(self, row: int, col: int):
-        if col == 0:
-            self._pick_element_for_row(row)
+    def _on_tbl_double_clicked(self, index):
+        if index.column() == 0:
+            self._pick_element_for_row(index.row())
 
     def accept(self):
         # Prüfe, ob mindestens eine gültige Fraction eingegeben wurde
         has_fraction = False
-        for r in range(self.tbl.rowCount()):
-            f_item = self.tbl.item(r, 1)
-            if f_item:
-                try:
-                    fr = float(f_item.text().strip())
-                    if fr != 0.0:
-                        has_fraction = True
-                        break
-                except Exception:
-                    continue
+        for _z, _label, f_text in self._model.rows():
+            try:
+                if float((f_text or "").strip()) != 0.0:
+                    has_fraction = True
+                    break
+            except Exception:
+                continue
         if not has_fraction:
             QMessageBox.warning(self, "Error", "You have to set fraction!")
             return
         super().accept()
 
 
+class _SaveRunnable(QRunnable):
+    """
+    Serializes and atomically writes a compounds snapshot off the UI
+    thread. A class-level mutex serializes in-flight writers; errors are
+    reported back through the signal passed in, which Qt delivers to the
+    UI thread via a queued connection.
+    """
+
+    _write_lock = QMutex()
+
+    def __init__(self, payload: list, path: Path, failed_signal):
+        super().__init__()
+        self._payload = payload
+        self._path = path
+        self._failed = failed_signal
+
+    def run(self):
+        try:
+            text = json.dumps(self._payload, indent=2, ensure_ascii=False) + "\n"
+            tmp = self._path.with_suffix(".json.tmp")
+            with QMutexLocker(self._write_lock):
+                tmp.write_text(text, encoding="utf-8")
+                os.replace(tmp, self._path)
+        except Exception as e:
+            self._failed.emit(str(e))
+
+
 class CompoundDictionaryDialog(QDialog):
     compound_selected = pyqtSignal(dict)
+    _save_failed = pyqtSignal(str)
 
     def __init__(self, parent=None, editable: bool = True):
         super().__init__(parent)
@@ -429,8 +641,34 @@ class CompoundDictionaryDialog(QDialog):
         self.compounds: list[dict] = self._load_compounds(self._compounds_path)
         self._collect_all_sections()
         self.current_index = None
-
-        layout = QVBoxLayout(self)
+        # formatted info HTML per compound identity; re-selecting a
+        # compound reuses the rendered string
+        self._info_cache: dict[int, str] = {}
+
+        # saves are debounced: mutations mark the dialog dirty and the
+        # serialize + atomic write runs once the timer fires, so a burst
+        # of edits costs one write
+        self._dirty = False
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(100)
+        self._save_timer.timeout.connect(self._flush_save)
+        self._save_failed.connect(self._on_save_failed)
+
+        # only the root layout exists up front; the widgets, icons and
+        # view population are deferred to the first showEvent, so merely
+        # constructing the dialog stays cheap
+        self._ui_built = False
+        self._root_layout = QVBoxLayout(self)
+
+    def showEvent(self, ev):
+        if not self._ui_built:
+            self._build_full_ui()
+            self._ui_built = True
+        super().showEvent(ev)
+
+    def _build_full_ui(self):
+        layout = self._root_layout
 
         self.tabs = QTabWidget()
         layout.addWidget(self.tabs)
@@ -497,33 +735,16 @@ class CompoundDictionaryDialog(QDialog):
             pass
 
     def _load_compounds(self, path: Path) -> list[dict]:
-        def _strip_json_comments_and_fix(s: str) -> str:
-            # remove // comments
-            s = re.sub(r"(?m)^\s*//.*?$", "", s)
-            # remove /* ... */ comments
-            s = re.sub(r"/\*.*?\*/", "", s, flags=re.S)
-            # replace unicode ellipsis placeholders like {…} with {}
-            s = s.replace("{…}", "{}").replace("{…}", "{}").replace("…", "null")
-            # remove trailing commas before } or ]
-            s = re.sub(r",(\s*[}\]])", r"\1", s)
-            return s
-
         try:
-            raw = json.loads(path.read_text(encoding="utf-8"))
-        except Exception:
-            # fallback: tolerate comments / trailing commas / {…}
-            try:
-                txt = _strip_json_comments_and_fix(path.read_text(encoding="utf-8"))
-                raw = json.loads(txt)
-            except Exception as e:
-                QMessageBox.warning(self, "Compound Dictionary", f"Could not load compounds:\n{e}")
-                return []
-
-        if not isinstance(raw, list):
+            st = os.stat(path)
+            raw = _load_compounds_cached(str(path), st.st_mtime_ns, st.st_size)
+        except Exception as e:
+            QMessageBox.warning(self, "Compound Dictionary", f"Could not load compounds:\n{e}")
             return []
 
         out: list[dict] = []
-        for c in raw:
+        # deep copy so in-dialog edits never mutate the cached parse
+        for c in copy.deepcopy(raw):
             if not isinstance(c, dict):
                 continue
             c.setdefault("name_display", c.get("name", ""))
@@ -540,47 +761,114 @@ class CompoundDictionaryDialog(QDialog):
                 self._all_sections.add(s)
         # Lade persistente leere Kategorien (falls gewünscht, hier im RAM)
         # Optional: persistente Speicherung in Datei möglich
+        self._sections_sorted_cache = None
 
     def _save_compounds(self):
-        try:
-            self._compounds_path.write_text(
-                json.dumps(self.compounds, indent=2, ensure_ascii=False) + "\n",
-                encoding="utf-8",
-            )
-        except Exception as e:
-            QMessageBox.critical(self, "Compound Dictionary", f"Could not save compounds:\n{e}")
+        self._dirty = True
+        self._save_timer.start()
+        # free text may have changed; drop the memoized escapes
+        _escape.cache_clear()
         self._collect_all_sections()
 
+    def _flush_save(self):
+        if not self._dirty:
+            return
+        # snapshot the list so further edits cannot race the writer,
+        # then hand serialization and the atomic swap to the pool; the
+        # UI thread only pays for the deepcopy
+        payload = copy.deepcopy(self.compounds)
+        QThreadPool.globalInstance().start(
+            _SaveRunnable(payload, self._compounds_path, self._save_failed))
+        _load_compounds_cached.cache_clear()
+        self._dirty = False
+
+    def _on_save_failed(self, msg: str):
+        QMessageBox.critical(self, "Compound Dictionary", f"Could not save compounds:\n{msg}")
+
+    def done(self, result):
+        # write any pending edits before the dialog goes away
+        if self._dirty:
+            self._save_timer.stop()
+            self._flush_save()
+        super().done(result)
+
+    def _refresh_lower_names(self):
+        # lowercase display names, computed once per (re)population;
+        # the sorts below then compare prebuilt strings instead of doing
+        # dict lookups and .lower() calls per comparison
+        self._lower_names = [
+            (c.get("name_display") or c.get("name") or "").lower()
+            for c in self.compounds
+        ]
+
     def _populate_section_tree(self):
-        from collections import defaultdict
-        sections = defaultdict(list)
-        for idx, compound in enumerate(self.compounds):
-            key = compound.get("section") or "Uncategorized"
-            sections[key].append(idx)
-        # Ergänze leere Kategorien
+        self._refresh_lower_names()
+        self._tree_items_by_idx: dict[int, QTreeWidgetItem] = {}
+        self._tree_parents_by_section: dict[str, QTreeWidgetItem] = {}
+
+        # one sort over (section, name) keys replaces the defaultdict
+        # build plus a separate per-section sort; sentinel entries with
+        # idx -1 keep empty categories visible
+        keys = [((c.get("section") or "Uncategorized").lower(),
+                 c.get("section") or "Uncategorized",
+                 self._lower_names[i],
+                 i)
+                for i, c in enumerate(self.compounds)]
+        seen = {k[1] for k in keys}
         for s in self._all_sections:
-            if s not in sections:
-                sections[s] = []
-        for section, indices in sorted(sections.items(), key=lambda item: item[0].lower()):
+            if s not in seen:
+                keys.append((s.lower(), s, "", -1))
+        keys.sort()
+
+        # build all items detached, then attach them in one bulk call so
+        # the tree lays out once instead of once per insertion
+        parents = []
+        for (_sec_lower, section), group in groupby(keys, key=lambda k: k[:2]):
             parent = QTreeWidgetItem([section])
             parent.setFlags(parent.flags() & ~Qt.ItemFlag.ItemIsSelectable)
-            self.section_tree.addTopLevelItem(parent)
-            for idx in sorted(indices, key=lambda i: self.compounds[i].get("name_display", "").lower()):
+            children = []
+            for _, _, _, idx in group:
+                if idx < 0:
+                    continue
                 child = QTreeWidgetItem([self.compounds[idx].get("name_display", self.compounds[idx].get("name", "Unnamed"))])
                 child.setData(0, Qt.ItemDataRole.UserRole, idx)
-                parent.addChild(child)
+                self._tree_items_by_idx[idx] = child
+                children.append(child)
+            parent.addChildren(children)
             parent.setExpanded(False)
+            self._tree_parents_by_section[section] = parent
+            parents.append(parent)
+
+        self.section_tree.setUpdatesEnabled(False)
+        self.section_tree.blockSignals(True)
+        try:
+            self.section_tree.addTopLevelItems(parents)
+        finally:
+            self.section_tree.blockSignals(False)
+            self.section_tree.setUpdatesEnabled(True)
 
     def _populate_alpha_list(self):
         self.alpha_indices = sorted(
             range(len(self.compounds)),
-            key=lambda i: self.compounds[i].get("name_display", self.compounds[i].get("name", "")).lower(),
+            key=self._lower_names.__getitem__,
         )
+        self._list_items_by_idx: dict[int, QListWidgetItem] = {}
+        items = []
         for idx in self.alpha_indices:
             name = self.compounds[idx].get("name_display", self.compounds[idx].get("name", "Unnamed"))
             item = QListWidgetItem(name)
             item.setData(Qt.ItemDataRole.UserRole, idx)
-            self.alpha_list.addItem(item)
+            self._list_items_by_idx[idx] = item
+            items.append(item)
+
+        self.alpha_list.setUpdatesEnabled(False)
+        self.alpha_list.blockSignals(True)
+        try:
+            for item in items:
+                self.alpha_list.addItem(item)
+        finally:
+            self.alpha_list.blockSignals(False)
+            self.alpha_list.setUpdatesEnabled(True)
 
     def _handle_section_selection(self):
         item = self.section_tree.currentItem()
@@ -613,12 +901,17 @@ class CompoundDictionaryDialog(QDialog):
             return
         self.current_index = idx
         compound = self.compounds[idx]
-        self.info_label.setText(self._format_compound_info(compound))
+        key = id(compound)
+        text = self._info_cache.get(key)
+        if text is None:
+            text = self._format_compound_info(compound)
+            self._info_cache[key] = text
+        self.info_label.setText(text)
         self.add_btn.setEnabled(True)
 
     def _format_compound_info(self, compound):
-        name = html.escape(compound.get("name_display", compound.get("name", "Unnamed")))
-        section = html.escape(compound.get("section", "Uncategorized"))
+        name = _escape(compound.get("name_display", compound.get("name", "Unnamed")))
+        section = _escape(compound.get("section", "Uncategorized"))
         density = compound.get("density_g_cm3")
         density_star = compound.get("density_g_cm3_star")
         density_text = []
@@ -626,21 +919,18 @@ class CompoundDictionaryDialog(QDialog):
             density_text.append(f"{density} g/cm³")
         if density_star is not None and density_star != density:
             density_text.append(f"(★ {density_star} g/cm³)")
+        composition = compound.get("composition", [])
+        total = sum(float(p["fraction"]) for p in composition
+                    if p.get("fraction") is not None)
+        inv_total = (100.0 / total) if total else 0.0
         composition_lines = []
-        total = 0.0
-        parts = []
-        for part in compound.get("composition", []):
+        for part in composition:
             fraction = part.get("fraction")
-            if fraction is None:
-                continue
-            parts.append(fraction)
-            total += float(fraction)
-        for part, fraction in zip(compound.get("composition", []), parts):
             z = part.get("Z")
-            if z is None:
+            if fraction is None or z is None:
                 continue
-            percent = (float(fraction) / total * 100.0) if total else 0.0
-            composition_lines.append(f"Z={z}: {fraction} ({percent:.2f}%)")
+            composition_lines.append(
+                f"Z={z}: {fraction} ({float(fraction) * inv_total:.2f}%)")
         notes = compound.get("notes") or []
         kv_items = compound.get("kv") or {}
         html_lines = [
@@ -648,13 +938,16 @@ class CompoundDictionaryDialog(QDialog):
             f"<p><b>Section:</b> {section}</p>",
         ]
         if density_text:
-            html_lines.append(f"<p><b>Density:</b> {' '.join(html.escape(x) for x in density_text)}</p>")
+            html_lines.append(f"<p><b>Density:</b> {' '.join(_escape(x) for x in density_text)}</p>")
         if composition_lines:
-            html_lines.append("<p><b>Composition:</b><br>" + "<br>".join(html.escape(line) for line in composition_lines) + "</p>")
+            # escape once over the joined lines, then turn the newlines
+            # into <br> so the separators themselves stay unescaped
+            body = html.escape("\n".join(composition_lines)).replace("\n", "<br>")
+            html_lines.append("<p><b>Composition:</b><br>" + body + "</p>")
         if kv_items:
-            html_lines.append("<p><b>Key Values:</b><br>" + "<br>".join(f"{html.escape(str(k))}: {html.escape(str(v))}" for k, v in kv_items.items()) + "</p>")
+            html_lines.append("<p><b>Key Values:</b><br>" + "<br>".join(f"{_escape(str(k))}: {_escape(str(v))}" for k, v in kv_items.items()) + "</p>")
         if notes:
-            html_lines.append("<p><b>Notes:</b><br>" + "<br>".join(html.escape(line) for line in notes if line) + "</p>")
+            html_lines.append("<p><b>Notes:</b><br>" + "<br>".join(_escape(line) for line in notes if line) + "</p>")
         return "".join(html_lines)
 
     def _emit_selection(self):
@@ -674,10 +967,9 @@ class CompoundDictionaryDialog(QDialog):
         bar = QHBoxLayout()
 
         def _theme_icon_multi(names: list[str], fallback: QStyle.StandardPixmap) -> QIcon:
-            for n in names:
-                ico = QIcon.fromTheme(n)
-                if not ico.isNull():
-                    return ico
+            ico = _theme_icon_from_names(tuple(names))
+            if ico is not None:
+                return ico
             return self.style().standardIcon(fallback)
 
         def _icon_btn(icon: QIcon, tooltip: str) -> QToolButton:
@@ -704,12 +996,12 @@ class CompoundDictionaryDialog(QDialog):
         )
         # add category: folder+plus
         self.btn_add_category = _icon_btn(
-            self._folder_badge_icon(254, badge="plus", folder_fill="#289C0B", badge_border="#2D9C0B", badge_fill="#2D9C0B"), 
+            self._cached_badge_icon(254, badge="plus", folder_fill="#289C0B", badge_border="#2D9C0B", badge_fill="#2D9C0B"),
             "Add category",
         )
         # delete category: folder-minus icon preferred
         self.btn_delete_category = _icon_btn(
-            self._folder_badge_icon(254, badge="minus", folder_fill="#AA2828"), 
+            self._cached_badge_icon(254, badge="minus", folder_fill="#AA2828"),
             "Delete category (and all its compounds)",
         )
 
@@ -734,8 +1026,12 @@ class CompoundDictionaryDialog(QDialog):
         self.btn_delete_category.clicked.connect(self._delete_category_main)
 
     def _existing_sections(self) -> list[str]:
-        # Gibt alle Kategorien zurück, auch leere
-        return sorted(set(self._all_sections) | {"Custom"}, key=str.lower)
+        # Gibt alle Kategorien zurück, auch leere; the sorted list is
+        # cached until the section set changes
+        if self._sections_sorted_cache is None:
+            self._sections_sorted_cache = sorted(
+                set(self._all_sections) | {"Custom"}, key=str.lower)
+        return self._sections_sorted_cache
 
     def _add_category_main(self):
         text, ok = QInputDialog.getText(self, "Add category", "Category name:")
@@ -746,6 +1042,7 @@ class CompoundDictionaryDialog(QDialog):
             return
         if s not in self._all_sections:
             self._all_sections.add(s)
+            self._sections_sorted_cache = None
             self._rebuild_compound_view()
         QMessageBox.information(self, "Kategorie hinzugefügt", f"Die Kategorie '{s}' ist nun auswählbar und sichtbar.")
 
@@ -763,6 +1060,7 @@ class CompoundDictionaryDialog(QDialog):
         # Lösche alle Compounds dieser Kategorie
         self.compounds = [c for c in self.compounds if (c.get("section") or "").strip() != cat]
         self._all_sections.discard(cat)
+        self._sections_sorted_cache = None
         self._save_compounds()
         self._rebuild_compound_view()
 
@@ -777,7 +1075,7 @@ class CompoundDictionaryDialog(QDialog):
             self._all_sections.add(sec)
         self.compounds.append(comp)
         self._save_compounds()
-        self._rebuild_compound_view()
+        self._insert_view_items(len(self.compounds) - 1, comp)
 
     def _edit_selected_compound(self):
         idx = self._selected_compound_index()
@@ -792,7 +1090,10 @@ class CompoundDictionaryDialog(QDialog):
             self._all_sections.add(sec)
         self.compounds[idx] = comp
         self._save_compounds()
-        self._rebuild_compound_view()
+        self._info_cache.clear()
+        self._remove_view_items(idx)
+        self._insert_view_items(idx, comp)
+        self._set_current_index(idx)
 
     def _delete_selected_compound(self):
         idx = self._selected_compound_index()
@@ -803,7 +1104,10 @@ class CompoundDictionaryDialog(QDialog):
             return
         self.compounds.pop(idx)
         self._save_compounds()
-        self._rebuild_compound_view()
+        self._info_cache.clear()
+        self._remove_view_items(idx)
+        self._shift_indices_after_delete(idx)
+        self._set_current_index(None)
 
     def _restore_defaults(self):
         if not self._default_path.exists():
@@ -822,13 +1126,95 @@ class CompoundDictionaryDialog(QDialog):
     def _selected_compound_index(self) -> int:
         return int(self.current_index) if self.current_index is not None else -1
 
+    # --- targeted view updates -------------------------------------------
+    # Single-compound add/edit/delete mutate only the affected tree child
+    # and list item instead of repopulating both views; the full rebuild
+    # below remains the fallback for category operations and restore.
+
+    def _section_parent(self, section: str) -> QTreeWidgetItem:
+        parent = self._tree_parents_by_section.get(section)
+        if parent is None:
+            parent = QTreeWidgetItem([section])
+            parent.setFlags(parent.flags() & ~Qt.ItemFlag.ItemIsSelectable)
+            sec_lower = section.lower()
+            pos = 0
+            while (pos < self.section_tree.topLevelItemCount()
+                   and self.section_tree.topLevelItem(pos).text(0).lower() < sec_lower):
+                pos += 1
+            self.section_tree.insertTopLevelItem(pos, parent)
+            self._tree_parents_by_section[section] = parent
+        return parent
+
+    def _insert_view_items(self, idx: int, compound: dict):
+        name = compound.get("name_display", compound.get("name", "Unnamed"))
+        name_lower = name.lower()
+
+        parent = self._section_parent(compound.get("section") or "Uncategorized")
+        child = QTreeWidgetItem([name])
+        child.setData(0, Qt.ItemDataRole.UserRole, idx)
+        pos = 0
+        while pos < parent.childCount() and parent.child(pos).text(0).lower() < name_lower:
+            pos += 1
+        parent.insertChild(pos, child)
+        self._tree_items_by_idx[idx] = child
+
+        item = QListWidgetItem(name)
+        item.setData(Qt.ItemDataRole.UserRole, idx)
+        pos = 0
+        while pos < self.alpha_list.count() and self.alpha_list.item(pos).text().lower() < name_lower:
+            pos += 1
+        self.alpha_list.insertItem(pos, item)
+        self._list_items_by_idx[idx] = item
+
+    def _remove_view_items(self, idx: int):
+        child = self._tree_items_by_idx.pop(idx, None)
+        if child is not None:
+            parent = child.parent()
+            parent.removeChild(child)
+            section = parent.text(0)
+            if parent.childCount() == 0 and section not in self._all_sections:
+                self.section_tree.takeTopLevelItem(
+                    self.section_tree.indexOfTopLevelItem(parent))
+                self._tree_parents_by_section.pop(section, None)
+        item = self._list_items_by_idx.pop(idx, None)
+        if item is not None:
+            self.alpha_list.takeItem(self.alpha_list.row(item))
+
+    def _shift_indices_after_delete(self, idx: int):
+        # compounds after idx moved down by one; renumber the stored
+        # indices and the UserRole payloads of the affected items
+        for old in sorted(k for k in self._tree_items_by_idx if k > idx):
+            child = self._tree_items_by_idx.pop(old)
+            child.setData(0, Qt.ItemDataRole.UserRole, old - 1)
+            self._tree_items_by_idx[old - 1] = child
+        for old in sorted(k for k in self._list_items_by_idx if k > idx):
+            item = self._list_items_by_idx.pop(old)
+            item.setData(Qt.ItemDataRole.UserRole, old - 1)
+            self._list_items_by_idx[old - 1] = item
+
     def _rebuild_compound_view(self):
+        self._info_cache.clear()
         self.section_tree.clear()
         self.alpha_list.clear()
         self._populate_section_tree()
         self._populate_alpha_list()
         self._set_current_index(None)
 
+    @staticmethod
+    @functools.lru_cache(maxsize=16)
+    def _cached_badge_icon(
+        size: int = 32,
+        badge: str = "minus",
+        folder_fill: Optional[str] = None,
+        badge_fill: str = "#DC0000",
+        badge_border: str = "#8C0000",
+    ) -> QIcon:
+        """Cached _folder_badge_icon; colors are passed as hex strings so
+        the arguments stay hashable. These icons never change per
+        instance, so the QPainter rasterization runs once per variant."""
+        return CompoundDictionaryDialog._folder_badge_icon(
+            size, badge, folder_fill, badge_fill, badge_border)
+
     @staticmethod
     def _folder_badge_icon(
         size: int = 32,
@@ -840,6 +1226,26 @@ class CompoundDictionaryDialog(QDialog):
         app = QApplication.instance()
         style = app.style()
 
+        bb = badge_border if isinstance(badge_border, QColor) else QColor(badge_border)
+        bf = badge_fill if isinstance(badge_fill, QColor) else QColor(badge_fill)
+        tint = None
+        if folder_fill is not None:
+            tint = folder_fill if isinstance(folder_fill, QColor) else QColor(folder_fill)
+        # normalize the badge kind once instead of per drawing branch
+        is_plus = str(badge).lower() == "plus"
+
+        # QPixmapCache lookup keyed by all parameters, so the theme
+        # lookup and QPainter rasterization below run once per variant
+        # even across call sites that bypass _cached_badge_icon
+        tint_name = tint.name() if tint is not None else "none"
+        key = (f"cdd-badge:{size}:{'plus' if is_plus else 'minus'}:{tint_name}"
+               f":{bf.name()}:{bb.name()}")
+        cached = QPixmapCache.find(key)
+        if cached is not None and not cached.isNull():
+            icon = QIcon()
+            icon.addPixmap(cached, QIcon.Mode.Normal, QIcon.State.Off)
+            return icon
+
         # Basis: symbolic folder aus Theme, sonst Qt-Fallback
         base = QIcon.fromTheme("folder-symbolic")
         if base.isNull():
@@ -856,34 +1262,34 @@ class CompoundDictionaryDialog(QDialog):
         p.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
 
         # --- optional: folder tint (Füllfarbe) ---
-        if folder_fill is not None:
-            tint = folder_fill if isinstance(folder_fill, QColor) else QColor(folder_fill)
-            # Copy, then tint alpha mask
-            tinted = QPixmap(pm.size())
-            tinted.fill(Qt.GlobalColor.transparent)
-
-            pt = QPainter(tinted)
-            pt.setRenderHint(QPainter.RenderHint.Antialiasing, True)
-            pt.drawPixmap(0, 0, pm)
-            pt.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceIn)
-            pt.fillRect(tinted.rect(), tint)
-            pt.end()
-
-            p.drawPixmap(0, 0, tinted)
-        else:
-            p.drawPixmap(0, 0, pm)
+        p.drawPixmap(0, 0, pm)
+        if tint is not None:
+            # tint the alpha mask in place: out holds only the folder at
+            # this point, so no intermediate tinted pixmap is needed
+            p.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceIn)
+            p.fillRect(out.rect(), tint)
+            p.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceOver)
+
+        CompoundDictionaryDialog._paint_badge(p, float(size), is_plus, bf, bb)
 
-        s = float(size)
+        p.end()
+        QPixmapCache.insert(key, out)
+        # register the pixmap at its actual size so the views don't
+        # resample it when rendering the icon
+        icon = QIcon()
+        icon.addPixmap(out, QIcon.Mode.Normal, QIcon.State.Off)
+        return icon
 
+    @staticmethod
+    def _paint_badge(p: QPainter, s: float, is_plus: bool,
+                     bf: QColor, bb: QColor) -> None:
+        """Draw the plus/minus badge into the lower right corner."""
         # Badge Geometrie (unten rechts)
         badge_d = max(12.0, s * 0.5)
         margin  = max(1.0,  s * 0.06)
         badge_rect = QRectF(s - badge_d - margin, s - badge_d - margin, badge_d, badge_d)
 
         border_w = max(1.0, s * 0.04)
-        bb = badge_border if isinstance(badge_border, QColor) else QColor(badge_border)
-        bf = badge_fill if isinstance(badge_fill, QColor) else QColor(badge_fill)
-
         p.setPen(QPen(bb, border_w))
         p.setBrush(QBrush(bf))
         p.drawEllipse(badge_rect)
@@ -904,10 +1310,7 @@ class CompoundDictionaryDialog(QDialog):
         p.drawLine(QPointF(x1, cy), QPointF(x2, cy))
 
         # Vertikale Linie nur für Plus
-        if str(badge).lower() == "plus":
+        if is_plus:
             y1 = cy - (badge_d / 2.0 - inset)
             y2 = cy + (badge_d / 2.0 - inset)
-            p.drawLine(QPointF(cx, y1), QPointF(cx, y2))
-
-        p.end()
-        return QIcon(out)
\ No newline at end of file
+            p.drawLine(QPointF(cx, y1), QPointF(cx, y2))
\ No newline at end of file
@@ -2,10 +2,12 @@ from __future__ import annotations
 
 from typing import Optional
 
-from PyQt6.QtCore import Qt
+import numpy as np
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QGroupBox, QLabel,
-    QLineEdit, QSpinBox, QDoubleSpinBox, QComboBox, QTableWidget, QTableWidgetItem,
+    QLineEdit, QSpinBox, QDoubleSpinBox, QComboBox, QTableView,
     QHeaderView, QStackedWidget, QCheckBox, QPushButton, QMessageBox, QDialog,
     QSplitter, QScrollArea,
     QSizePolicy,
@@ -21,6 +23,137 @@ from app.ui.widgets.periodic_table_picker import PeriodicTableButton, PeriodicTa
 from app.ui.dialogs.compound_dictionary_dialog import CompoundDictionaryDialog
 
 
+class ElementTableModel(QAbstractTableModel):
+    """Table model backed directly by the page's element entry list.
+
+    No QTableWidgetItem is allocated per cell; the view pulls formatted
+    text lazily for the visible cells only. Only the stoichiometric
+    ratio (column 4) is editable; a ratio edit touches the edited cell
+    and the shared percent column, nothing else.
+    """
+
+    HEADERS = [
+        "Symbol", "Name", "Atomic No.", "Weight (amu)",
+        "Atom Stoich", "Atom Stoich %", "Damage (eV)",
+        "Disp (eV)", "Latt (eV)", "Surf (eV)",
+    ]
+
+    def __init__(self, entries: list[dict], parent=None):
+        super().__init__(parent)
+        self._entries = entries
+        self._total = 0.0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._entries)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.HEADERS)
+
+    @staticmethod
+    def _format_static_texts(entry):
+        """Format the cell texts that don't depend on the ratio total.
+
+        The tuple is indexed by column; the ratio and percent slots stay
+        None as those two are the only texts that change per refresh.
+        """
+        element = entry["element"]
+        mass_raw = element.get("atomic_mass")
+        try:
+            mass_text = f"{float(mass_raw):.3f}"
+        except (TypeError, ValueError):
+            mass_text = str(mass_raw)
+        return (
+            element["symbol"], element["name"], str(element["number"]),
+            mass_text, None, None,
+            str(entry["damage"]), str(entry["disp"]),
+            str(entry["latt"]), str(entry["surf"]),
+        )
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return None
+        entry = self._entries[index.row()]
+        col = index.column()
+        if col == 4:
+            return f"{entry['ratio']:.4f}"
+        if col == 5:
+            percent = (entry["ratio"] / self._total * 100.0) if self._total else 0.0
+            return f"{percent:.2f}"
+        # static texts are formatted once per entry and cached on it;
+        # repaints then cost a tuple index instead of format calls
+        texts = entry.get("_texts")
+        if texts is None:
+            texts = entry["_texts"] = self._format_static_texts(entry)
+        return texts[col]
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.EditRole or index.column() != 4:
+            return False
+        try:
+            ratio = max(float(value), 0.0)
+        except (TypeError, ValueError):
+            ratio = 0.0
+        entry = self._entries[index.row()]
+        if ratio != entry["ratio"]:
+            entry["ratio"] = ratio
+            self._total = sum(e["ratio"] for e in self._entries)
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole])
+            self.dataChanged.emit(self.index(0, 5),
+                                  self.index(len(self._entries) - 1, 5),
+                                  [Qt.ItemDataRole.DisplayRole])
+        return True
+
+    def flags(self, index):
+        fl = Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled
+        if index.column() == 4:
+            fl |= Qt.ItemFlag.ItemIsEditable
+        return fl
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if (orientation == Qt.Orientation.Horizontal
+                and role == Qt.ItemDataRole.DisplayRole):
+            return self.HEADERS[section]
+        return None
+
+    def refresh(self, total_ratio):
+        """Re-read the backing entries after structural changes."""
+        self.beginResetModel()
+        self._total = total_ratio
+        self.endResetModel()
+
+
+class ResultTableModel(QAbstractTableModel):
+    """Read-only model for the energy/range/straggling result list."""
+
+    HEADERS = ["Energy (keV)", "Range (µm)", "Straggling (µm)"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: list[tuple] = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._rows[index.row()][index.column()]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if (orientation == Qt.Orientation.Horizontal
+                and role == Qt.ItemDataRole.DisplayRole):
+            return self.HEADERS[section]
+        return None
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self._rows = list(rows)
+        self.endResetModel()
+
+
 class KoralPage(QWidget):
     def __init__(self, state: AppState, parent=None):
         super().__init__(parent)
@@ -30,13 +163,24 @@ class KoralPage(QWidget):
         self.element_entries: list[dict] = []
 
         self.layer_elements: list[list[dict]] = []  # ...existing code (now unused)...
-        self._updating_elements_table = False
+        # Fingerprint of the last refreshed table contents; a refresh
+        # with an identical fingerprint is skipped outright
+        self._refresh_key = None
+
+        # Default energy parameters per element dict identity, with the
+        # "<key>_eV" lookup keys formatted once instead of per call
+        self._energy_defaults_cache: dict[int, dict] = {}
+        self._energy_default_items = tuple(
+            (key, f"{key}_eV", fallback)
+            for key, fallback in self.state.energy_defaults.items())
 
         # Plot fullscreen toggle bookkeeping
         self._plot_fullscreen_dialog: Optional[QDialog] = None
         self._plot_widget: Optional[QWidget] = None
         self._plot_grid: Optional(QGridLayout) = None
         self._plot_placeholder: Optional[QWidget] = None
+        # original grid cell of the plot widget (row, col, rowspan, colspan)
+        self._plot_cell = (0, 0, 1, 3)
 
         layout = QVBoxLayout(self)
         layout.setSpacing(10)
@@ -191,14 +335,8 @@ class KoralPage(QWidget):
         self.energy_max.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
         grid.addWidget(self.energy_max, 1, 6, Qt.AlignmentFlag.AlignLeft)
 
-        # Force extra horizontal space to the far right (keeps fields packed on the left)
-        grid.setColumnStretch(0, 0)
-        grid.setColumnStretch(1, 0)
-        grid.setColumnStretch(2, 0)
-        grid.setColumnStretch(3, 0)
-        grid.setColumnStretch(4, 0)
-        grid.setColumnStretch(5, 0)
-        grid.setColumnStretch(6, 0)
+        # Force extra horizontal space to the far right (keeps fields
+        # packed on the left); stretch defaults to 0 for all other columns
         grid.setColumnStretch(7, 1)  # trailing stretch column
 
         layout.addLayout(grid)
@@ -240,12 +378,12 @@ class KoralPage(QWidget):
         controls.addWidget(dict_btn)
         v.addLayout(controls)
 
-        self.elem_table = QTableWidget(0, 10)
-        self.elem_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.elem_table.setHorizontalHeaderLabels([
-            "Symbol", "Name", "Atomic No.", "Weight (amu)",
-            "Atom Stoich", "Atom Stoich %", "Damage (eV)", "Disp (eV)", "Latt (eV)", "Surf (eV)"
-        ])
+        # model/view instead of QTableWidget: the model is backed by
+        # element_entries directly, so no per-cell items exist at all
+        self.elem_model = ElementTableModel(self.element_entries, self)
+        self.elem_table = QTableView()
+        self.elem_table.setModel(self.elem_model)
+        self.elem_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         self.elem_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.elem_table.verticalHeader().setVisible(False)
         self.elem_table.setAlternatingRowColors(True)
@@ -257,8 +395,7 @@ class KoralPage(QWidget):
 
         v.addWidget(self.elem_table)
 
-        self.elem_table.itemChanged.connect(self._handle_element_item_changed)
-        self.elem_table.cellDoubleClicked.connect(self._handle_element_cell_double_clicked)
+        self.elem_table.doubleClicked.connect(self._handle_element_cell_double_clicked)
         del_elem.clicked.connect(self.delete_selected_elements)
 
         return box
@@ -269,7 +406,11 @@ class KoralPage(QWidget):
     def delete_selected_elements(self):
         if not hasattr(self, "elem_table"):
             return
-        rows = sorted({idx.row() for idx in self.elem_table.selectedIndexes()}, reverse=True)
+        # SelectRows behavior: selectedRows() yields one index per row,
+        # instead of one per cell as selectedIndexes() does
+        rows = sorted((idx.row() for idx in
+                       self.elem_table.selectionModel().selectedRows()),
+                      reverse=True)
         for r in rows:
             if 0 <= r < len(self.element_entries):
                 self.element_entries.pop(r)
@@ -287,49 +428,59 @@ class KoralPage(QWidget):
         ]
         if not components:
             return
-        for part in components:
-            element = self.state.elements_by_number.get(int(part["Z"]))
-            if not element:
-                continue
-            self._add_element_to_table(element, float(part["fraction"]), refresh=False)
+        # extract and coerce Z/fraction up front, fetch the elements in
+        # one C-level map pass, and extend the entry list in one go
+        zs = [int(part["Z"]) for part in components]
+        fracs = [float(part["fraction"]) for part in components]
+        elements = map(self.state.elements_by_number.get, zs)
+        self.element_entries.extend(
+            self._make_entry(element, frac)
+            for element, frac in zip(elements, fracs) if element)
         self._refresh_element_table()
 
-    def _add_element_to_table(self, element: dict, ratio: float, overrides: Optional[dict] = None, refresh: bool = True):
+    def _make_entry(self, element: dict, ratio: float, overrides: Optional[dict] = None) -> dict:
         energy_defaults = self._get_default_energy_params(element)
         if overrides:
             for key, value in overrides.items():
                 if value is not None:
                     energy_defaults[key] = str(value)
+        return {
+            "element": element,
+            "ratio": ratio,
+            "damage": energy_defaults["damage"],
+            "disp": energy_defaults["disp"],
+            "latt": energy_defaults["latt"],
+            "surf": energy_defaults["surf"],
+        }
 
+    def _add_element_to_table(self, element: dict, ratio: float, overrides: Optional[dict] = None, refresh: bool = True):
         try:
             ratio_value = float(ratio)
         except (TypeError, ValueError):
             ratio_value = 0.0
 
-        self.element_entries.append({
-            "element": element,
-            "ratio": ratio_value,
-            "damage": energy_defaults["damage"],
-            "disp": energy_defaults["disp"],
-            "latt": energy_defaults["latt"],
-            "surf": energy_defaults["surf"],
-        })
+        self.element_entries.append(self._make_entry(element, ratio_value, overrides))
         if refresh:
             self._refresh_element_table()
 
     def _get_default_energy_params(self, element: dict) -> dict:
-        params = {}
-        for key, fallback in self.state.energy_defaults.items():
-            candidate = element.get(f"{key}_eV", element.get(key, fallback))
-            params[key] = str(candidate)
-        return params
+        # element dicts are shared from state.elements_by_number, so the
+        # defaults are memoized per dict identity; callers mutate the
+        # result, hence the copy on return
+        params = self._energy_defaults_cache.get(id(element))
+        if params is None:
+            params = {
+                key: str(element.get(ev_key, element.get(key, fallback)))
+                for key, ev_key, fallback in self._energy_default_items
+            }
+            self._energy_defaults_cache[id(element)] = params
+        return dict(params)
 
     def _refresh_element_table(self):
         if not hasattr(self, "elem_table"):
             return
 
         entries = self.element_entries
-        self._updating_elements_table = True
 
         # normalize + fill defaults
         for entry in entries:
@@ -342,54 +493,27 @@ class KoralPage(QWidget):
             for key in ("damage", "disp", "latt", "surf"):
                 entry.setdefault(key, defaults[key])
 
-        total_ratio = sum(e["ratio"] for e in entries)
-        self.elem_table.setRowCount(len(entries))
-
-        def ro_item(text: str):
-            it = QTableWidgetItem(text)
-            it.setFlags(Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled)
-            return it
-
-        for row, entry in enumerate(entries):
-            element = entry["element"]
-            mass_raw = element.get("atomic_mass")
-            try:
-                mass_text = f"{float(mass_raw):.3f}"
-            except (TypeError, ValueError):
-                mass_text = str(mass_raw)
-
-            self.elem_table.setItem(row, 0, ro_item(element["symbol"]))
-            self.elem_table.setItem(row, 1, ro_item(element["name"]))
-            self.elem_table.setItem(row, 2, ro_item(str(element["number"])))
-            self.elem_table.setItem(row, 3, ro_item(mass_text))
-
-            ratio_item = QTableWidgetItem(f"{entry['ratio']:.4f}")
-            ratio_item.setFlags(Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEditable | Qt.ItemFlag.ItemIsEnabled)
-            self.elem_table.setItem(row, 4, ratio_item)
-
-            percent = (entry["ratio"] / total_ratio * 100.0) if total_ratio else 0.0
-            self.elem_table.setItem(row, 5, ro_item(f"{percent:.2f}"))
-
-            for offset, key in enumerate(("damage", "disp", "latt", "surf"), start=6):
-                self.elem_table.setItem(row, offset, ro_item(str(entry[key])))
-
-        self._updating_elements_table = False
-
-    def _handle_element_item_changed(self, item):
-        if self._updating_elements_table:
-            return
-        row = item.row()
-        if not (0 <= row < len(self.element_entries)):
+        # vectorized ratio sum and percents instead of Python-level
+        # iteration per refresh
+        ratios = np.fromiter((e["ratio"] for e in entries),
+                             dtype=np.float64, count=len(entries))
+        total_ratio = ratios.sum()
+
+        # skip the refresh if nothing visible changed since the last
+        # pass (no-op edits would otherwise trigger full repaints)
+        key = (tuple((id(e["element"]), e.get("damage")) for e in entries),
+               ratios.tobytes())
+        if key == self._refresh_key:
             return
+        self._refresh_key = key
 
-        if item.column() == 4:
-            try:
-                self.element_entries[row]["ratio"] = max(float(item.text()), 0.0)
-            except ValueError:
-                self.element_entries[row]["ratio"] = 0.0
-            self._refresh_element_table()
+        # a single model reset; ratio edits never come through here,
+        # they are handled by ElementTableModel.setData with targeted
+        # dataChanged emissions
+        self.elem_model.refresh(total_ratio)
 
-    def _handle_element_cell_double_clicked(self, row, column):
+    def _handle_element_cell_double_clicked(self, index):
+        row, column = index.row(), index.column()
         if column != 0:
             return
         if not (0 <= row < len(self.element_entries)):
@@ -401,8 +525,10 @@ class KoralPage(QWidget):
     def _replace_element_row(self, row: int, element: dict):
         if not (0 <= row < len(self.element_entries)):
             return
-        self.element_entries[row]["element"] = element
-        self.element_entries[row].update(self._get_default_energy_params(element))
+        entry = self.element_entries[row]
+        entry["element"] = element
+        entry.update(self._get_default_energy_params(element))
+        entry.pop("_texts", None)   # cached cell texts are stale now
         self._refresh_element_table()
 
     # --- existing KORAL-specific options/plot section ---
@@ -486,12 +612,49 @@ class KoralPage(QWidget):
         self.koral_plot_list_stack = QStackedWidget()
         v.addWidget(self.koral_plot_list_stack)
 
-        # Plot page
+        # Plot page; the Matplotlib canvas itself is built lazily on
+        # first display (see _ensure_plot_built)
         plot_page = QWidget()
         grid = QGridLayout(plot_page)
         grid.setContentsMargins(4, 4, 4, 4)
 
-        # Create the Matplotlib figure and canvas (+ toolbar)
+        self._plot_grid = grid
+        self._plot_built = False
+
+        grid.setColumnStretch(1, 1)
+        self.koral_plot_list_stack.addWidget(plot_page)
+
+        # List page
+        list_page = QWidget()
+        lv = QVBoxLayout(list_page)
+        self.koral_result_model = ResultTableModel(self)
+        self.koral_result_table = QTableView()
+        self.koral_result_table.setModel(self.koral_result_model)
+        self.koral_result_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.koral_result_table.verticalHeader().setVisible(False)
+        self.koral_result_table.setAlternatingRowColors(True)
+
+        # the placeholder rows are filled in on first display of the
+        # list page, not during construction
+        self._list_populated = False
+
+        lv.addWidget(self.koral_result_table)
+        self.koral_plot_list_stack.addWidget(list_page)
+
+        self.koral_plot_list_stack.setCurrentIndex(0)
+        return box
+
+    def _ensure_plot_built(self):
+        """Build the Matplotlib figure, canvas, and toolbar on demand.
+
+        Figure/FigureCanvas construction costs hundreds of
+        milliseconds; it is deferred until the plot page is actually
+        shown. Nothing is plotted until real data arrives.
+        """
+        if self._plot_built:
+            return
+        self._plot_built = True
+
         self.figure = Figure(figsize=(5, 3))
         self.canvas = FigureCanvas(self.figure)
         self.toolbar = NavigationToolbar2QT(self.canvas, self)
@@ -500,13 +663,8 @@ class KoralPage(QWidget):
         ax.set_title("Range and Straggling vs Energy")
         ax.set_xlabel("Energy (keV)")
         ax.set_ylabel("Range / Straggling (µm)")
-        energy = [10, 20, 30]
-        ax.plot(energy, [0.5, 1.0, 1.5], label="Range", marker="o")
-        ax.plot(energy, [0.1, 0.2, 0.3], label="Straggling", marker="s")
-        ax.legend()
 
         # Wrap toolbar+canvas into a single movable widget
-        self._plot_grid = grid
         self._plot_widget = QWidget()
         plot_v = QVBoxLayout(self._plot_widget)
         plot_v.setContentsMargins(0, 0, 0, 0)
@@ -522,30 +680,22 @@ class KoralPage(QWidget):
         self.canvas.mpl_connect("button_press_event", self._handle_plot_double_click)
 
         # Add the plot widget to the grid layout
-        grid.addWidget(self._plot_widget, 0, 0, 1, 3)  # Span all columns
+        self._plot_grid.addWidget(self._plot_widget, *self._plot_cell)  # Span all columns
 
-        grid.setColumnStretch(1, 1)
-        self.koral_plot_list_stack.addWidget(plot_page)
-
-        # List page
-        list_page = QWidget()
-        lv = QVBoxLayout(list_page)
-        self.koral_result_table = QTableWidget(3, 3)
-        self.koral_result_table.setHorizontalHeaderLabels(["Energy (keV)", "Range (µm)", "Straggling (µm)"])
-        self.koral_result_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.koral_result_table.verticalHeader().setVisible(False)
-        self.koral_result_table.setAlternatingRowColors(True)
-
-        for row, (e, r, s) in enumerate([("10", "0.5", "0.1"), ("20", "1.0", "0.2"), ("30", "1.5", "0.3")]):
-            self.koral_result_table.setItem(row, 0, QTableWidgetItem(e))
-            self.koral_result_table.setItem(row, 1, QTableWidgetItem(r))
-            self.koral_result_table.setItem(row, 2, QTableWidgetItem(s))
-
-        lv.addWidget(self.koral_result_table)
-        self.koral_plot_list_stack.addWidget(list_page)
-
-        self.koral_plot_list_stack.setCurrentIndex(0)
-        return box
+    def _ensure_list_populated(self):
+        """Fill the result list with its placeholder rows on demand."""
+        if self._list_populated:
+            return
+        self._list_populated = True
+        self.koral_result_model.set_rows(
+            [("10", "0.5", "0.1"), ("20", "1.0", "0.2"), ("30", "1.5", "0.3")])
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.koral_plot_list_stack.currentIndex() == 0:
+            self._ensure_plot_built()
+        else:
+            self._ensure_list_populated()
 
     def _handle_plot_double_click(self, event):
         if getattr(event, "dblclick", False):
@@ -560,36 +710,43 @@ class KoralPage(QWidget):
             self._plot_fullscreen_dialog.close()
             return
 
-        # Move plot widget into a fullscreen dialog
-        dlg = QDialog(self)
-        dlg.setWindowTitle("Plot")
-        dlg.setModal(False)
+        # The fullscreen dialog is created once and reused; dialog
+        # construction is costly under compositing window systems
+        dlg = self._plot_fullscreen_dialog
+        if dlg is None:
+            dlg = QDialog(self)
+            dlg.setWindowTitle("Plot")
+            dlg.setModal(False)
 
-        lay = QVBoxLayout(dlg)
-        lay.setContentsMargins(0, 0, 0, 0)
-        lay.setSpacing(0)
+            lay = QVBoxLayout(dlg)
+            lay.setContentsMargins(0, 0, 0, 0)
+            lay.setSpacing(0)
+
+            dlg.finished.connect(self._restore_plot_widget)
+            self._plot_fullscreen_dialog = dlg
 
         # Keep grid cell occupied while plot is detached
         self._plot_grid.removeWidget(self._plot_widget)
         if self._plot_placeholder:
-            self._plot_grid.addWidget(self._plot_placeholder, 1, 1)
+            self._plot_grid.addWidget(self._plot_placeholder, *self._plot_cell)
 
         self._plot_widget.setParent(dlg)
-        lay.addWidget(self._plot_widget)
-
-        def _restore():
-            if not self._plot_widget or not self._plot_grid:
-                return
-            # Remove placeholder and put plot widget back into its original cell
-            if self._plot_placeholder:
-                self._plot_grid.removeWidget(self._plot_placeholder)
-                self._plot_placeholder.setParent(None)
-            self._plot_widget.setParent(self._plot_grid.parentWidget())
-            self._plot_grid.addWidget(self._plot_widget, 1, 1)
-
-        dlg.finished.connect(_restore)
-        self._plot_fullscreen_dialog = dlg
+        dlg.layout().addWidget(self._plot_widget)
         dlg.showFullScreen()
 
+    def _restore_plot_widget(self, *_):
+        if not self._plot_widget or not self._plot_grid:
+            return
+        # Remove placeholder and put plot widget back into its original cell
+        if self._plot_placeholder:
+            self._plot_grid.removeWidget(self._plot_placeholder)
+            self._plot_placeholder.setParent(None)
+        self._plot_widget.setParent(self._plot_grid.parentWidget())
+        self._plot_grid.addWidget(self._plot_widget, *self._plot_cell)
+
     def _update_koral_plot_view(self, checked: bool):
         self.koral_plot_list_stack.setCurrentIndex(1 if checked else 0)
+        if checked:
+            self._ensure_list_populated()
+        else:
+            self._ensure_plot_built()
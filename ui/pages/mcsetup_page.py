@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+import json
+import os
 from datetime import datetime
+from pathlib import Path
 from typing import Callable, Optional
 
-from PyQt6.QtCore import Qt, QTimer
+import numpy as np
+
+from PyQt6.QtCore import Qt, QThread, QAbstractTableModel, QModelIndex, pyqtSignal
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QGroupBox, QLabel,
     QLineEdit, QSpinBox, QDoubleSpinBox, QCheckBox, QPushButton,
-    QTableWidget, QTableWidgetItem, QHeaderView, QComboBox,
+    QTableView, QHeaderView, QComboBox,
+    QStyledItemDelegate,
     QFrame, QDialog, QListWidget, QDialogButtonBox, QMessageBox,
 )
 
@@ -16,6 +22,263 @@ from app.ui.widgets.periodic_table_picker import PeriodicTableButton, PeriodicTa
 from app.ui.dialogs.compound_dictionary_dialog import CompoundDictionaryDialog
 
 
+# Flag combinations built once: the Python-level enum OR is not free and
+# flags() runs for every visible cell
+RO_FLAGS = Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled
+RW_FLAGS = RO_FLAGS | Qt.ItemFlag.ItemIsEditable
+GAS_FLAGS = RO_FLAGS | Qt.ItemFlag.ItemIsUserCheckable
+
+
+class ElementTableModel(QAbstractTableModel):
+    """Table model over the element entries of the selected layer.
+
+    The model holds a reference to the entry list of whichever layer is
+    currently shown; switching layers or structural edits go through
+    set_entries() as a single model reset. No per-cell items exist, the
+    view asks data() for visible cells only. Only the stoichiometric
+    ratio (column 4) is editable; a ratio edit touches the edited cell
+    and the shared percent column.
+    """
+
+    # tuples: immutable, built once at class creation, and cheaper for
+    # the binding layer to convert than per-call lists
+    HEADERS = (
+        "Symbol", "Name", "Atomic No.", "Weight (amu)",
+        "Atom Stoich", "Atom Stoich %", "Damage (eV)",
+        "Disp (eV)", "Latt (eV)", "Surf (eV)",
+    )
+
+    # delta of the ratio total after an edit, so the page can keep its
+    # cached per-layer total in sync
+    totalChanged = pyqtSignal(float)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._entries: list[dict] = []
+        self._total = 0.0
+        # percent column as one vectorized pass, recomputed lazily after
+        # any change that moves the total
+        self._percents = None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._entries)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return None
+        entry = self._entries[index.row()]
+        col = index.column()
+        if col == 4:
+            return f"{entry['ratio']:.4f}"
+        if col == 5:
+            pcts = self._percents
+            if pcts is None:
+                pcts = self._compute_percents()
+            return f"{pcts[index.row()]:.2f}"
+        texts = entry.get("_texts")
+        if texts is None:
+            texts = self._format_static_texts(entry)
+        return texts[col]
+
+    @staticmethod
+    def _format_static_texts(entry):
+        """Format the texts of an entry that only change with its element.
+
+        Cached on the entry itself; the ratio and percent slots stay
+        None because they depend on live state and are formatted in
+        data(). Dropped by the page when the entry's element changes.
+        """
+        element = entry["element"]
+        mass_raw = element.get("atomic_mass")
+        try:
+            mass = f"{float(mass_raw):.3f}"
+        except (TypeError, ValueError):
+            mass = str(mass_raw)
+        texts = (element["symbol"], element["name"], str(element["number"]),
+                 mass, None, None,
+                 str(entry["damage"]), str(entry["disp"]),
+                 str(entry["latt"]), str(entry["surf"]))
+        entry["_texts"] = texts
+        return texts
+
+    def _compute_percents(self):
+        ratios = np.fromiter((e["ratio"] for e in self._entries),
+                             dtype=np.float64, count=len(self._entries))
+        self._percents = (ratios * (100.0 / self._total) if self._total
+                          else np.zeros_like(ratios))
+        return self._percents
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.EditRole or index.column() != 4:
+            return False
+        try:
+            ratio = max(float(value), 0.0)
+        except (TypeError, ValueError):
+            ratio = 0.0
+        entry = self._entries[index.row()]
+        if ratio != entry["ratio"]:
+            # incremental total: old contribution out, new one in
+            delta = ratio - entry["ratio"]
+            self._total += delta
+            entry["ratio"] = ratio
+            self._percents = None
+            self.totalChanged.emit(delta)
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole])
+            self.dataChanged.emit(self.index(0, 5),
+                                  self.index(len(self._entries) - 1, 5),
+                                  [Qt.ItemDataRole.DisplayRole])
+        return True
+
+    def flags(self, index):
+        return RW_FLAGS if index.column() == 4 else RO_FLAGS
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if (orientation == Qt.Orientation.Horizontal
+                and role == Qt.ItemDataRole.DisplayRole):
+            return self.HEADERS[section]
+        return None
+
+    def set_entries(self, entries, total_ratio):
+        """Point the model at a layer's entry list (single reset)."""
+        self.beginResetModel()
+        self._entries = entries
+        self._total = total_ratio
+        self._percents = None
+        self.endResetModel()
+
+
+class LayersTableModel(QAbstractTableModel):
+    """Table model over the target-layer definitions.
+
+    Rows are plain dicts ("name", "width", "unit", "density",
+    "compound_corr", "gas"), so collecting the configuration reads the
+    dicts directly instead of round-tripping every cell through a
+    QTableWidgetItem. The gas column is exposed through the check-state
+    role; the other columns are editable text.
+    """
+
+    HEADERS = ("Layer", "Width", "Units", "Density (g/cm³)", "Compound Corr", "Gas")
+    KEYS = ("name", "width", "unit", "density", "compound_corr")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: list[dict] = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        row = self._rows[index.row()]
+        col = index.column()
+        if col == 5:
+            if role == Qt.ItemDataRole.CheckStateRole:
+                return (Qt.CheckState.Checked if row["gas"]
+                        else Qt.CheckState.Unchecked)
+            return None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return row[self.KEYS[col]]
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        row = self._rows[index.row()]
+        col = index.column()
+        if col == 5:
+            if role != Qt.ItemDataRole.CheckStateRole:
+                return False
+            row["gas"] = Qt.CheckState(value) == Qt.CheckState.Checked
+        elif role == Qt.ItemDataRole.EditRole:
+            row[self.KEYS[col]] = str(value)
+        else:
+            return False
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def flags(self, index):
+        if index.column() == 5:
+            return GAS_FLAGS
+        return RW_FLAGS
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if (orientation == Qt.Orientation.Horizontal
+                and role == Qt.ItemDataRole.DisplayRole):
+            return self.HEADERS[section]
+        return None
+
+    def append_row(self, row):
+        r = len(self._rows)
+        self.beginInsertRows(QModelIndex(), r, r)
+        self._rows.append(row)
+        self.endInsertRows()
+
+    def remove_row(self, r):
+        self.beginRemoveRows(QModelIndex(), r, r)
+        del self._rows[r]
+        self.endRemoveRows()
+
+    def set_rows(self, rows):
+        """Replace all layer rows in a single reset."""
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+
+
+class UnitComboDelegate(QStyledItemDelegate):
+    """Combo-box editor for the unit column without persistent widgets.
+
+    The cell paints its text like any other; a QComboBox only exists
+    while the cell is actually being edited, instead of one live widget
+    (plus layout) per row.
+    """
+
+    def __init__(self, options, parent=None):
+        super().__init__(parent)
+        self._options = options
+
+    def createEditor(self, parent, option, index):
+        combo = QComboBox(parent)
+        combo.addItems(self._options)
+        return combo
+
+    def setEditorData(self, editor, index):
+        i = editor.findText(index.data() or "")
+        if i >= 0:
+            editor.setCurrentIndex(i)
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentText(), Qt.ItemDataRole.EditRole)
+
+
+class SimulationWorker(QThread):
+    """Background stand-in for a Monte-Carlo run.
+
+    Emits ``progressChanged`` once per ``update_after`` ions, so the GUI
+    thread wakes in proportion to simulation progress instead of on a
+    fixed timer tick.
+    """
+
+    progressChanged = pyqtSignal(int)
+
+    def __init__(self, n_ions, update_after, parent=None):
+        super().__init__(parent)
+        self._n_ions = max(1, int(n_ions))
+        self._update_after = max(1, int(update_after))
+
+    def run(self):
+        done = 0
+        while done < self._n_ions:
+            chunk = min(self._update_after, self._n_ions - done)
+            # placeholder for simulating the next chunk of ions
+            self.msleep(5)
+            done += chunk
+            self.progressChanged.emit(done * 100 // self._n_ions)
+
+
 class MCSetupPage(QWidget):
     def __init__(self, state: AppState, on_log: Optional[Callable[[str], None]] = None, parent=None):
         super().__init__(parent)
@@ -23,11 +286,30 @@ class MCSetupPage(QWidget):
         self._on_log = on_log
 
         self.layer_elements = []
-        self._updating_elements_table = False
+        # Ratio totals per layer, maintained at the mutation points so
+        # refreshes don't re-sum; _model_layer_idx is the layer the
+        # element model currently wraps
+        self._layer_totals: list[float] = []
+        self._model_layer_idx = -1
+        # refresh short-circuit: the layer the element table last
+        # showed, and whether its entries changed since then
+        self._last_layer_shown = -1
+        self._elements_dirty = True
+        # Default energy parameters per element dict identity, with the
+        # "<key>_eV" lookup keys formatted once instead of per call
+        self._energy_defaults_cache: dict[int, dict] = {}
+        # Z-keyed copy of the defaults persisted across sessions;
+        # loaded lazily from disk on the first lookup
+        self._persistent_energy_defaults: Optional[dict] = None
+        self._energy_default_items = tuple(
+            (key, f"{key}_eV", fallback)
+            for key, fallback in self.state.energy_defaults.items())
         self.latest_log_button = None
         self.mc_progress = None
         self.run_button = None
-        self._progress_timer = None
+        self._sim_worker = None
+        self._periodic_dialog = None
+        self._pending_replace = None
         self.no_of_ions_spin = None
         self.update_after_ions_spin = None
 
@@ -44,14 +326,36 @@ class MCSetupPage(QWidget):
         middle.addWidget(self.build_input_elements(), stretch=1)
         layout.addLayout(middle)
 
-        layout.addWidget(self.build_model_selection())
-        layout.addWidget(self.build_trajectories_output())
+        # model selection, output options, and the footer are deferred
+        # to first show (see showEvent); placeholders keep their spots
+        # in the layout so the visual order is unchanged
+        self._model_placeholder = QWidget()
+        self._trajectories_placeholder = QWidget()
+        self._footer_placeholder = QWidget()
+        layout.addWidget(self._model_placeholder)
+        layout.addWidget(self._trajectories_placeholder)
 
         layout.addStretch(1)
-        layout.addWidget(self._build_mc_setup_footer())
+        layout.addWidget(self._footer_placeholder)
+
+        self._page_layout = layout
+        self._deferred_built = False
 
         self._refresh_element_table()
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._deferred_built:
+            return
+        self._deferred_built = True
+        for placeholder, builder in (
+            (self._model_placeholder, self.build_model_selection),
+            (self._trajectories_placeholder, self.build_trajectories_output),
+            (self._footer_placeholder, self._build_mc_setup_footer),
+        ):
+            self._page_layout.replaceWidget(placeholder, builder())
+            placeholder.deleteLater()
+
     # -------- external bridge ----------
     def update_latest_log(self, entry: str):
         if self.latest_log_button:
@@ -79,19 +383,15 @@ class MCSetupPage(QWidget):
         }
 
         layers = []
-        for row in range(self.layers_table.rowCount()):
-            unit_widget = self.layers_table.cellWidget(row, 2)
-            unit = unit_widget.currentText() if isinstance(unit_widget, QComboBox) else ""
-            gas_widget = self.layers_table.cellWidget(row, 5)
-            gas_checkbox = gas_widget.findChild(QCheckBox) if gas_widget else None
+        for row, row_data in enumerate(self.layers_model._rows):
             entries = self.layer_elements[row] if row < len(self.layer_elements) else []
             layer = {
-                "name": (self.layers_table.item(row, 0).text() if self.layers_table.item(row, 0) else ""),
-                "width": (self.layers_table.item(row, 1).text() if self.layers_table.item(row, 1) else ""),
-                "unit": unit,
-                "density": (self.layers_table.item(row, 3).text() if self.layers_table.item(row, 3) else ""),
-                "compound_corr": (self.layers_table.item(row, 4).text() if self.layers_table.item(row, 4) else ""),
-                "gas": gas_checkbox.isChecked() if gas_checkbox else False,
+                "name": row_data["name"],
+                "width": row_data["width"],
+                "unit": row_data["unit"],
+                "density": row_data["density"],
+                "compound_corr": row_data["compound_corr"],
+                "gas": row_data["gas"],
                 "elements": [
                     {
                         "Z": entry["element"]["number"],
@@ -137,41 +437,44 @@ class MCSetupPage(QWidget):
                 pass
 
         layers = payload.get("layers") or []
-        self.layers_table.setRowCount(0)
+        # build the row dicts first and hand them to the model in one
+        # reset, instead of inserting and repainting row by row
+        rows = []
         self.layer_elements = []
+        self._layer_totals = []
         for idx, layer_data in enumerate(layers):
-            self.layers_table.insertRow(idx)
-            self.seed_layer_row(idx)
+            rows.append(self._layer_row_from_data(layer_data))
             self.layer_elements.append([])
-            self._apply_layer_data(idx, layer_data)
+            self._layer_totals.append(0.0)
+            self._apply_layer_elements(idx, layer_data)
 
-        if not layers:
-            self.layers_table.insertRow(0)
-            self.seed_layer_row(0)
+        if not rows:
+            rows = [self._new_layer_row(0)]
             self.layer_elements = [[]]
+            self._layer_totals = [0.0]
+        self.layers_model.set_rows(rows)
 
-        if self.layers_table.rowCount():
-            self.layers_table.selectRow(0)
+        self._elements_dirty = True
+        self.layers_table.selectRow(0)
         self._refresh_element_table()
 
-    def _apply_layer_data(self, row: int, data: dict):
-        for col, key in enumerate(["name", "width", None, "density", "compound_corr"]):
-            if key is None:
-                continue
-            self.layers_table.setItem(row, col, QTableWidgetItem(str(data.get(key, ""))))
-
-        unit_widget = self.layers_table.cellWidget(row, 2)
-        if isinstance(unit_widget, QComboBox):
-            idx = unit_widget.findText(data.get("unit", "Ång"))
-            if idx >= 0:
-                unit_widget.setCurrentIndex(idx)
-
-        gas_widget = self.layers_table.cellWidget(row, 5)
-        gas_checkbox = gas_widget.findChild(QCheckBox) if gas_widget else None
-        if gas_checkbox:
-            gas_checkbox.setChecked(bool(data.get("gas", False)))
+    def _layer_row_from_data(self, data: dict) -> dict:
+        row = {
+            "name": str(data.get("name", "")),
+            "width": str(data.get("width", "")),
+            "unit": "Ång",
+            "density": str(data.get("density", "")),
+            "compound_corr": str(data.get("compound_corr", "")),
+            "gas": bool(data.get("gas")),
+        }
+        unit = data.get("unit", "Ång")
+        if unit in self.state.unit_options:
+            row["unit"] = unit
+        return row
 
+    def _apply_layer_elements(self, row: int, data: dict):
         self.layer_elements[row] = []
+        self._layer_totals[row] = 0.0
         for entry in data.get("elements", []):
             number = entry.get("Z") or entry.get("number")
             element = self.state.elements_by_number.get(int(number)) if number else None
@@ -237,59 +540,84 @@ class MCSetupPage(QWidget):
         controls.addWidget(add_layer); controls.addWidget(del_layer); controls.addStretch(1)
         v.addLayout(controls)
 
-        self.layers_table = QTableWidget(1, 6)
-        self.layers_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.layers_table.setHorizontalHeaderLabels(["Layer", "Width", "Units", "Density (g/cm³)", "Compound Corr", "Gas"])
-        self.layers_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.layers_model = LayersTableModel(self)
+        self.layers_model.append_row(self._new_layer_row(0))
+        self.layers_table = QTableView()
+        self.layers_table.setModel(self.layers_model)
+        self.layers_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self._fix_header_widths(self.layers_table, LayersTableModel.HEADERS)
+        self.layers_table.setItemDelegateForColumn(
+            2, UnitComboDelegate(tuple(self.state.unit_options), self.layers_table))
         self.layers_table.verticalHeader().setVisible(False)
         self.layers_table.setAlternatingRowColors(True)
-
-        self.seed_layer_row(0)
         v.addWidget(self.layers_table)
 
         self.layer_elements.append([])
+        self._layer_totals.append(0.0)
         self.layers_table.selectRow(0)
-        self.layers_table.itemSelectionChanged.connect(self._handle_layer_selection_changed)
+        self.layers_table.selectionModel().selectionChanged.connect(
+            self._handle_layer_selection_changed)
 
         add_layer.clicked.connect(self.add_layer_row)
         del_layer.clicked.connect(self.delete_selected_layers)
         return box
 
-    def seed_layer_row(self, r: int):
-        self.layers_table.setItem(r, 0, QTableWidgetItem(f"Layer {r + 1}"))
-        self.layers_table.setItem(r, 1, QTableWidgetItem("10000" if r == 0 else ""))
-        unit_combo = QComboBox(); unit_combo.addItems(self.state.unit_options); unit_combo.setCurrentText("Ång")
-        self.layers_table.setCellWidget(r, 2, unit_combo)
-        self.layers_table.setItem(r, 3, QTableWidgetItem("1.0" if r == 0 else ""))
-        self.layers_table.setItem(r, 4, QTableWidgetItem("0"))
-        gas_chk = QCheckBox()
-        gas_widget = QWidget(); lay = QHBoxLayout(gas_widget); lay.setContentsMargins(0, 0, 0, 0)
-        lay.addWidget(gas_chk); lay.addStretch(1)
-        self.layers_table.setCellWidget(r, 5, gas_widget)
+    @staticmethod
+    def _new_layer_row(r: int) -> dict:
+        return {
+            "name": f"Layer {r + 1}",
+            "width": "10000" if r == 0 else "",
+            "unit": "Ång",
+            "density": "1.0" if r == 0 else "",
+            "compound_corr": "0",
+            "gas": False,
+        }
 
     def add_layer_row(self):
-        r = self.layers_table.rowCount()
-        self.layers_table.insertRow(r)
-        self.seed_layer_row(r)
+        r = self.layers_model.rowCount()
+        self.layers_model.append_row(self._new_layer_row(r))
         self.layer_elements.append([])
+        self._layer_totals.append(0.0)
         self.layers_table.selectRow(r)
 
     def delete_selected_layers(self):
-        rows = sorted({idx.row() for idx in self.layers_table.selectedIndexes()}, reverse=True)
+        # selectedRows() yields one index per row, not one per cell, so
+        # no dedup set is needed
+        rows = sorted((idx.row() for idx in
+                       self.layers_table.selectionModel().selectedRows()),
+                      reverse=True)
         for r in rows:
-            self.layers_table.removeRow(r)
+            self.layers_model.remove_row(r)
             if 0 <= r < len(self.layer_elements):
                 self.layer_elements.pop(r)
-        if self.layers_table.rowCount() == 0:
-            self.layers_table.insertRow(0)
-            self.seed_layer_row(0)
+                self._layer_totals.pop(r)
+        if self.layers_model.rowCount() == 0:
+            self.layers_model.append_row(self._new_layer_row(0))
             self.layer_elements = [[]]
-        self.layers_table.selectRow(min(self.layers_table.rowCount() - 1, 0))
+            self._layer_totals = [0.0]
+        # deleting rows shifts which entries a layer index refers to
+        self._elements_dirty = True
+        self.layers_table.selectRow(min(self.layers_model.rowCount() - 1, 0))
         self._refresh_element_table()
 
-    def _handle_layer_selection_changed(self):
+    def _handle_layer_selection_changed(self, *args):
         self._refresh_element_table()
 
+    @staticmethod
+    def _fix_header_widths(table, headers):
+        """Fixed column widths derived from the header text.
+
+        Stretch mode re-measures every cell string on each insertion;
+        fixed widths keep population cost independent of the contents,
+        with the last section stretching to fill the viewport.
+        """
+        header = table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        fm = table.fontMetrics()
+        for i, label in enumerate(headers):
+            table.setColumnWidth(i, fm.horizontalAdvance(label) + 24)
+        header.setStretchLastSection(True)
+
     def build_input_elements(self) -> QGroupBox:
         box = QGroupBox("Atoms per layer")
         v = QVBoxLayout(box)
@@ -314,20 +642,20 @@ class MCSetupPage(QWidget):
         controls.addWidget(dict_btn)
         v.addLayout(controls)
 
-        self.elem_table = QTableWidget(0, 10)
-        self.elem_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.elem_table.setHorizontalHeaderLabels([
-            "Symbol", "Name", "Atomic No.", "Weight (amu)",
-            "Atom Stoich", "Atom Stoich %", "Damage (eV)", "Disp (eV)", "Latt (eV)", "Surf (eV)"
-        ])
-        self.elem_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        # model/view instead of QTableWidget: the model wraps the entry
+        # list of the current layer directly, no per-cell items exist
+        self.elem_model = ElementTableModel(self)
+        self.elem_table = QTableView()
+        self.elem_table.setModel(self.elem_model)
+        self.elem_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self._fix_header_widths(self.elem_table, ElementTableModel.HEADERS)
         self.elem_table.verticalHeader().setVisible(False)
         self.elem_table.setAlternatingRowColors(True)
 
         v.addWidget(self.elem_table)
 
-        self.elem_table.itemChanged.connect(self._handle_element_item_changed)
-        self.elem_table.cellDoubleClicked.connect(self._handle_element_cell_double_clicked)
+        self.elem_table.doubleClicked.connect(self._handle_element_cell_double_clicked)
+        self.elem_model.totalChanged.connect(self._apply_total_delta)
         del_elem.clicked.connect(self.delete_selected_elements)
 
         return box
@@ -342,11 +670,14 @@ class MCSetupPage(QWidget):
         layer_idx = self._current_layer_index()
         if layer_idx < 0:
             return
-        rows = sorted({idx.row() for idx in self.elem_table.selectedIndexes()}, reverse=True)
+        rows = sorted((idx.row() for idx in
+                       self.elem_table.selectionModel().selectedRows()),
+                      reverse=True)
         entries = self._get_layer_entries(layer_idx)
         for r in rows:
             if 0 <= r < len(entries):
-                entries.pop(r)
+                self._layer_totals[layer_idx] -= entries.pop(r)["ratio"]
+                self._elements_dirty = True
         self._refresh_element_table()
 
     def build_model_selection(self) -> QGroupBox:
@@ -479,27 +810,27 @@ class MCSetupPage(QWidget):
     def _handle_run_clicked(self):
         if not self.mc_progress or not self.run_button:
             return
+        if self._sim_worker is not None and self._sim_worker.isRunning():
+            return
         self.run_button.setEnabled(False)
         self.mc_progress.setValue(0)
         self.mc_progress.setFormat("%p% Complete")
-        if not self._progress_timer:
-            self._progress_timer = QTimer(self)
-            self._progress_timer.timeout.connect(self._advance_progress)
-        self._progress_timer.start(120)
+        n_ions = self.no_of_ions_spin.value() if self.no_of_ions_spin else 1
+        update_after = (self.update_after_ions_spin.value()
+                        if self.update_after_ions_spin else 1)
+        self._sim_worker = SimulationWorker(n_ions, update_after, self)
+        self._sim_worker.progressChanged.connect(self.mc_progress.setValue)
+        self._sim_worker.finished.connect(self._handle_run_finished)
+        self._sim_worker.start()
         self.add_log_entry("Simulation run started.")
 
-    def _advance_progress(self):
-        if not self.mc_progress:
-            return
-        value = self.mc_progress.value() + 5
-        self.mc_progress.setValue(min(value, 100))
-        if self.mc_progress.value() >= 100:
-            if self._progress_timer:
-                self._progress_timer.stop()
+    def _handle_run_finished(self):
+        if self.mc_progress:
+            self.mc_progress.setValue(100)
             self.mc_progress.setFormat("Complete")
-            if self.run_button:
-                self.run_button.setEnabled(True)
-            self.add_log_entry("Simulation run completed.")
+        if self.run_button:
+            self.run_button.setEnabled(True)
+        self.add_log_entry("Simulation run completed.")
 
     # -------- element/layer logic ----------
     def _open_compound_dictionary(self):
@@ -517,12 +848,18 @@ class MCSetupPage(QWidget):
         ]
         if not components:
             return
-        for part in components:
-            element = self.state.elements_by_number.get(int(part["Z"]))
+        # resolve all components first, then refresh the table once for
+        # the whole compound instead of once per element
+        zs = [int(part["Z"]) for part in components]
+        fracs = [float(part["fraction"]) for part in components]
+        added = False
+        for element, ratio in zip(map(self.state.elements_by_number.get, zs), fracs):
             if not element:
                 continue
-            ratio = float(part["fraction"])
-            self._add_element_to_layer(layer_idx, element, ratio)
+            self._add_element_to_layer(layer_idx, element, ratio, refresh=False)
+            added = True
+        if added:
+            self._refresh_element_table()
 
     def _add_element_to_layer(self, layer_idx, element, ratio, overrides=None, refresh=True):
         entries = self._get_layer_entries(layer_idx)
@@ -543,94 +880,110 @@ class MCSetupPage(QWidget):
             "latt": energy_defaults["latt"],
             "surf": energy_defaults["surf"],
         })
+        self._layer_totals[layer_idx] += ratio_value
+        self._elements_dirty = True
         if refresh:
             self._refresh_element_table()
 
-    def _get_default_energy_params(self, element: dict) -> dict:
-        params = {}
-        for key, fallback in self.state.energy_defaults.items():
-            candidate = element.get(f"{key}_eV", element.get(key, fallback))
-            params[key] = str(candidate)
-        return params
+    _ENERGY_CACHE_FILE = "energy_defaults.json"
 
-    def _refresh_element_table(self):
-        if not hasattr(self, "elem_table"):
-            return
-        layer_idx = self._current_layer_index()
-        entries = self._get_layer_entries(layer_idx) if layer_idx >= 0 else []
-        self._updating_elements_table = True
-
-        for entry in entries:
-            ratio_src = entry.get("ratio", entry.get("stoich", 0.0) or 0.0)
-            try:
-                entry["ratio"] = float(ratio_src)
-            except (TypeError, ValueError):
-                entry["ratio"] = 0.0
-            defaults = self._get_default_energy_params(entry["element"])
-            for key in ("damage", "disp", "latt", "surf"):
-                entry.setdefault(key, defaults[key])
-
-        total_ratio = sum(entry["ratio"] for entry in entries)
-        self.elem_table.setRowCount(len(entries))
+    def _energy_cache_path(self) -> Path:
+        base = getattr(self.state, "cache_dir", None)
+        if base is None:
+            base = Path.home() / ".cytrim"
+        return Path(base) / self._ENERGY_CACHE_FILE
 
-        for row, entry in enumerate(entries):
-            element = entry["element"]
-            mass_raw = element.get("atomic_mass")
+    def _load_energy_cache(self) -> dict:
+        if self._persistent_energy_defaults is None:
             try:
-                mass_text = f"{float(mass_raw):.3f}"
-            except (TypeError, ValueError):
-                mass_text = str(mass_raw)
-
-            def ro_item(text: str):
-                it = QTableWidgetItem(text)
-                it.setFlags(Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled)
-                return it
-
-            self.elem_table.setItem(row, 0, ro_item(element["symbol"]))
-            self.elem_table.setItem(row, 1, ro_item(element["name"]))
-            self.elem_table.setItem(row, 2, ro_item(str(element["number"])))
-            self.elem_table.setItem(row, 3, ro_item(mass_text))
-
-            ratio_item = QTableWidgetItem(f"{entry['ratio']:.4f}")
-            ratio_item.setFlags(Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEditable | Qt.ItemFlag.ItemIsEnabled)
-            self.elem_table.setItem(row, 4, ratio_item)
-
-            percent = (entry["ratio"] / total_ratio * 100.0) if total_ratio else 0.0
-            self.elem_table.setItem(row, 5, ro_item(f"{percent:.2f}"))
-
-            for offset, key in enumerate(("damage", "disp", "latt", "surf"), start=6):
-                self.elem_table.setItem(row, offset, ro_item(str(entry[key])))
+                with open(self._energy_cache_path(), encoding="utf-8") as fh:
+                    self._persistent_energy_defaults = json.load(fh)
+            except (OSError, ValueError):
+                self._persistent_energy_defaults = {}
+        return self._persistent_energy_defaults
+
+    def _store_energy_cache(self):
+        # best-effort write-through (atomic via os.replace); the cache
+        # is only an optimization, so disk errors are swallowed
+        path = self._energy_cache_path()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(path.name + ".tmp")
+            tmp.write_text(json.dumps(self._persistent_energy_defaults),
+                           encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError:
+            pass
 
-        self._updating_elements_table = False
+    def _get_default_energy_params(self, element: dict) -> dict:
+        # element dicts are shared from state.elements_by_number, so the
+        # defaults are memoized per dict identity; callers mutate the
+        # result, hence the copy on return. Misses read through the
+        # Z-keyed on-disk cache, so repeat elements across sessions
+        # skip the extraction entirely.
+        params = self._energy_defaults_cache.get(id(element))
+        if params is None:
+            cache = self._load_energy_cache()
+            z_key = str(element.get("number", ""))
+            params = cache.get(z_key)
+            if params is None:
+                params = {
+                    key: str(element.get(ev_key, element.get(key, fallback)))
+                    for key, ev_key, fallback in self._energy_default_items
+                }
+                cache[z_key] = params
+                self._store_energy_cache()
+            self._energy_defaults_cache[id(element)] = params
+        return dict(params)
 
-    def _handle_element_item_changed(self, item):
-        if self._updating_elements_table:
+    def _refresh_element_table(self):
+        if not hasattr(self, "elem_table"):
             return
         layer_idx = self._current_layer_index()
-        if layer_idx < 0:
+        # clicking around inside the already-shown layer is a no-op;
+        # entry mutations set _elements_dirty to force the reset
+        if layer_idx == self._last_layer_shown and not self._elements_dirty:
             return
-        entries = self._get_layer_entries(layer_idx)
-        row = item.row()
-        if row < 0 or row >= len(entries):
-            return
-        entry = entries[row]
-        if item.column() == 4:
-            try:
-                entry["ratio"] = max(float(item.text()), 0.0)
-            except ValueError:
-                entry["ratio"] = 0.0
-            self._refresh_element_table()
+        entries = self._get_layer_entries(layer_idx) if layer_idx >= 0 else []
 
-    def _handle_element_cell_double_clicked(self, row, column):
+        # entries are created only by _add_element_to_layer, which
+        # coerces the ratio and fills the energy defaults, so no
+        # per-refresh normalization pass is needed and the total is
+        # maintained at the mutation points
+        total_ratio = self._layer_totals[layer_idx] if layer_idx >= 0 else 0.0
+        self._model_layer_idx = layer_idx
+        self._last_layer_shown = layer_idx
+        self._elements_dirty = False
+        # a single model reset; ratio edits never come through here,
+        # they are handled by ElementTableModel.setData with targeted
+        # dataChanged emissions
+        self.elem_model.set_entries(entries, total_ratio)
+
+    def _handle_element_cell_double_clicked(self, index):
+        row, column = index.row(), index.column()
         if column != 0:
             return
         layer_idx = self._current_layer_index()
         entries = self._get_layer_entries(layer_idx)
         if row < 0 or row >= len(entries):
             return
-        dialog = PeriodicTableDialog(self, compact=True, show_hover_info=True, bordered=True)
-        dialog.element_selected.connect(lambda element, r=row, idx=layer_idx: self._replace_layer_element(idx, r, element))
-        dialog.exec()
+        # one dialog for the page's lifetime: the ~120-cell periodic
+        # grid is expensive to build, so construct it on first use and
+        # route the selection through _pending_replace
+        if self._periodic_dialog is None:
+            self._periodic_dialog = PeriodicTableDialog(
+                self, compact=True, show_hover_info=True, bordered=True)
+            self._periodic_dialog.element_selected.connect(
+                self._handle_replace_element_selected)
+        self._pending_replace = (layer_idx, row)
+        self._periodic_dialog.exec()
+
+    def _handle_replace_element_selected(self, element):
+        if self._pending_replace is None:
+            return
+        layer_idx, row = self._pending_replace
+        self._pending_replace = None
+        self._replace_layer_element(layer_idx, row, element)
 
     def _replace_layer_element(self, layer_idx, row, element):
         entries = self._get_layer_entries(layer_idx)
@@ -638,18 +991,30 @@ class MCSetupPage(QWidget):
             return
         entries[row]["element"] = element
         entries[row].update(self._get_default_energy_params(element))
+        entries[row].pop("_texts", None)
+        self._elements_dirty = True
         self._refresh_element_table()
 
     def _current_layer_index(self):
         if not hasattr(self, "layers_table"):
             return -1
-        row = self.layers_table.currentRow()
-        if row < 0 and self.layers_table.rowCount() > 0:
+        row = self.layers_table.currentIndex().row()
+        if row < 0 and self.layers_model.rowCount() > 0:
             row = 0
             self.layers_table.selectRow(0)
         return row
 
+    def _apply_total_delta(self, delta):
+        """Keep the cached layer total in sync with model ratio edits."""
+        idx = self._model_layer_idx
+        if 0 <= idx < len(self._layer_totals):
+            self._layer_totals[idx] += delta
+
     def _get_layer_entries(self, layer_idx):
-        while len(self.layer_elements) <= layer_idx:
-            self.layer_elements.append([])
-        return self.layer_elements[layer_idx] if layer_idx >= 0 else []
+        if layer_idx < 0:
+            return []
+        missing = layer_idx + 1 - len(self.layer_elements)
+        if missing > 0:
+            self.layer_elements.extend([] for _ in range(missing))
+            self._layer_totals.extend([0.0] * missing)
+        return self.layer_elements[layer_idx]
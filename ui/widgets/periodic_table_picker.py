@@ -1,10 +1,411 @@
 import json
 import os
-from PyQt6.QtWidgets import (QDialog, QWidget, QGridLayout, QPushButton, 
+from functools import lru_cache
+from types import SimpleNamespace
+from PyQt6.QtWidgets import (QDialog, QWidget, QGridLayout, QPushButton,
                              QVBoxLayout, QLabel, QScrollArea, QHBoxLayout, QFrame,
-                             QSizePolicy)
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QFont, QColor, QPainter, QPen
+                             QSizePolicy, QToolTip)
+from PyQt6.QtCore import Qt, QEvent, QTimer, pyqtSignal
+from PyQt6.QtGui import QFont, QFontMetrics, QColor, QPainter, QPen, QPixmap
+
+
+# ACS-style color mapping, built once at module load
+GROUP_COLORS = {
+    'alkali_metal': '#F39C12',
+    'alkaline_earth_metal': '#F7DC6F',
+    'transition_metal': '#2E86C1',
+    'post_transition_metal': '#4D5B6A',
+    'metalloid': '#9A8F56',
+    'nonmetal': '#7ED3A6',
+    'halogen': '#E6F28C',
+    'noble_gas': '#8E6EC8',
+    'lanthanide': '#D98AD5',
+    'actinide': '#6CC3B1',
+    'unknown': '#E0E0E0'
+}
+
+
+# display names for the legend, in presentation order
+GROUP_NAMES = {
+    'alkali_metal': 'Alkali',
+    'alkaline_earth_metal': 'Alk. Earth',
+    'transition_metal': 'Transition',
+    'post_transition_metal': 'Post-trans.',
+    'metalloid': 'Metalloid',
+    'nonmetal': 'Nonmetal',
+    'halogen': 'Halogen',
+    'noble_gas': 'Noble Gas',
+    'lanthanide': 'Lanthanide',
+    'actinide': 'Actinide'
+}
+
+
+def _element_group(element):
+    """Determine element group for color coding"""
+    category = element['category'].lower()
+    number = element['number']
+
+    # Special case: Hydrogen is a nonmetal, not alkali metal
+    if number == 1:
+        return 'nonmetal'
+
+    if 'alkali metal' in category and 'alkaline' not in category:
+        return 'alkali_metal'
+    elif 'alkaline earth' in category:
+        return 'alkaline_earth_metal'
+    elif 'lanthanide' in category:
+        return 'lanthanide'
+    elif 'actinide' in category:
+        return 'actinide'
+    elif 'transition metal' in category:
+        return 'transition_metal'
+    elif 'post-transition metal' in category:
+        return 'post_transition_metal'
+    elif 'metalloid' in category:
+        return 'metalloid'
+    elif 'noble gas' in category:
+        return 'noble_gas'
+    elif 'halogen' in category or number in [9, 17, 35, 53, 85]:
+        return 'halogen'
+    elif 'nonmetal' in category or 'diatomic nonmetal' in category:
+        return 'nonmetal'
+    else:
+        return 'unknown'
+
+
+def _text_color(bg_color):
+    """Determine text color based on background brightness"""
+    color = QColor(bg_color)
+    r, g, b = color.red() / 255, color.green() / 255, color.blue() / 255
+    luminance = 0.299 * r + 0.587 * g + 0.114 * b
+    return "white" if luminance < 0.6 else "#212529"
+
+
+def _lighten_color(color, factor):
+    """Lighten a color by a factor"""
+    qcolor = QColor(color)
+    h, s, l, a = qcolor.getHslF()
+    l = min(1.0, l * factor)
+    qcolor.setHslF(h, s, l, a)
+    return qcolor.name()
+
+
+def _font(size, weight=QFont.Weight.Normal):
+    """Shared QFont instances; construction hits the font database"""
+    font = _FONTS.get((size, weight))
+    if font is None:
+        font = _FONTS[(size, weight)] = QFont("Inter", size, weight)
+    return font
+
+
+_FONTS = {}
+
+
+def _make_info_formatter(label_text, unit, numeric=False):
+    """Pre-bound formatter for one hover-info field.
+
+    Whether a field holds numbers is known when the panel is built, so
+    the closure is specialized up front instead of type-checking the
+    value on every hover.
+    """
+    blank = f"{label_text} —"
+    suffix = f" {unit}" if unit else ""
+
+    if numeric:
+        def fmt(value):
+            if value is None or value == "":
+                return blank
+            return f"{label_text} {float(value):.3f}{suffix}"
+    else:
+        def fmt(value):
+            if value is None or value == "":
+                return blank
+            return f"{label_text} {value}{suffix}"
+
+    return fmt
+
+
+_JSON_PATH = os.path.join(os.path.dirname(__file__), 'PeriodicTableJSON.json')
+
+# Per-mode layout geometry, resolved once in __init__ instead of
+# branching on self.compact at every size in the builders
+_COMPACT_GEOM = SimpleNamespace(
+    margin=12,
+    section_spacing=8,
+    legend_spacing=8,
+    grid_spacing=1,
+    axis_font=7,
+    axis_label_px=12,
+    tile_size=40,
+    tile_radius=4,
+    tile_margin=3,
+    placeholder_font=7,
+    series_spacing=4,
+    series_font=8,
+    series_label_width=60,
+    info_min_height=120,
+    info_spacing=8,
+    info_header_spacing=12,
+    info_font=12,
+    info_symbol_font=16,
+    info_detail_font=9,
+    info_number_width=46,
+    info_symbol_width=72,
+    info_name_width=110,
+    info_grid_hspacing=10,
+    info_grid_vspacing=4,
+    info_columns=2,
+    info_row_height=18,
+)
+
+_FULL_GEOM = SimpleNamespace(
+    margin=20,
+    section_spacing=16,
+    legend_spacing=12,
+    grid_spacing=6,
+    axis_font=9,
+    axis_label_px=18,
+    tile_size=80,
+    tile_radius=8,
+    tile_margin=5,
+    placeholder_font=10,
+    series_spacing=8,
+    series_font=9,
+    series_label_width=100,
+    info_min_height=170,
+    info_spacing=12,
+    info_header_spacing=20,
+    info_font=18,
+    info_symbol_font=24,
+    info_detail_font=10,
+    info_number_width=56,
+    info_symbol_width=96,
+    info_name_width=160,
+    info_grid_hspacing=16,
+    info_grid_vspacing=6,
+    info_columns=3,
+    info_row_height=22,
+)
+
+
+@lru_cache(maxsize=None)
+def _swatch_pixmap(text, color_hex, size, radius, font_size):
+    """Rasterize a rounded colored swatch once per (text, color, size).
+
+    All keys are hashable scalars, so repeat dialog opens blit the
+    cached pixmap instead of re-parsing a per-label stylesheet and
+    re-rendering the rounded rect and text.
+    """
+    pixmap = QPixmap(size, size)
+    pixmap.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.setBrush(QColor(color_hex))
+    painter.setPen(QPen(QColor(0, 0, 0, 25), 1))
+    painter.drawRoundedRect(0, 0, size - 1, size - 1, radius, radius)
+    if text:
+        painter.setPen(QColor('white'))
+        painter.setFont(_font(font_size, QFont.Weight.Bold))
+        painter.drawText(0, 0, size, size,
+                         int(Qt.AlignmentFlag.AlignCenter), text)
+    painter.end()
+    return pixmap
+
+
+@lru_cache(maxsize=1)
+def _load_elements_cached(json_path):
+    """Read and parse the periodic table JSON exactly once per process"""
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    elements = {elem['number']: elem for elem in data['elements']}
+    # Precompute per-tile presentation data: group and colors are pure
+    # functions of the element, so the string scans and QColor math run
+    # once per element per process instead of per tile per dialog
+    for elem in elements.values():
+        group = _element_group(elem)
+        elem['_group'] = group
+        elem['_bg'] = QColor(GROUP_COLORS[group])
+        elem['_hover_bg'] = QColor(_lighten_color(GROUP_COLORS[group], 1.05))
+        elem['_fg'] = QColor(_text_color(GROUP_COLORS[group]))
+    return elements
+
+
+@lru_cache(maxsize=1)
+def _placement_cached(json_path):
+    """Resolve tile placement once per process.
+
+    Returns (main_cells, placeholders, series): (row, col, number)
+    tuples for the main grid, the lanthanide/actinide placeholder
+    cells, and the two series number sequences -- so dialog opens
+    iterate flat tuples instead of re-classifying every element.
+    """
+    elements = _load_elements_cached(json_path)
+    cells = []
+    placeholders = []
+    lanthanides = range(57, 72)
+    actinides = range(89, 104)
+    for number, elem in elements.items():
+        if number in lanthanides or number in actinides:
+            continue
+        if elem['period'] == 6 and elem['group'] == 3:
+            placeholders.append((6, 3, "57-71", 'lanthanide'))
+            continue
+        if elem['period'] == 7 and elem['group'] == 3:
+            placeholders.append((7, 3, "89-103", 'actinide'))
+            continue
+        cells.append((elem['period'], elem['group'], number))
+    series = (tuple(n for n in lanthanides if n in elements),
+              tuple(n for n in actinides if n in elements))
+    return tuple(cells), tuple(placeholders), series
+
+
+class ElementTile(QWidget):
+    """Custom-painted element tile.
+
+    Replaces a QPushButton holding a QVBoxLayout of styled QLabels: one
+    widget whose paintEvent draws the rounded background and the texts
+    directly, so a dialog creates ~118 widgets instead of ~500 and Qt
+    parses no per-tile stylesheets.
+    """
+
+    clicked = pyqtSignal(dict)
+
+    _HOVER_PEN = None       # shared pens, built on first paint
+    _NORMAL_PEN = None
+
+    def __init__(self, element, compact, parent=None):
+        super().__init__(parent)
+        self.element = element
+        self.compact = compact
+        self._hovered = False
+        geom = _COMPACT_GEOM if compact else _FULL_GEOM
+        self.setFixedSize(geom.tile_size, geom.tile_size)
+        self._radius = geom.tile_radius
+        self._margin = geom.tile_margin
+        # no setMouseTracking: enter/leave events arrive without it and
+        # hover only needs those, so Qt skips per-pixel move dispatch
+        self.setCursor(Qt.CursorShape.PointingHandCursor)
+
+    def enterEvent(self, event):
+        self._hovered = True
+        self.update()
+        super().enterEvent(event)
+
+    def leaveEvent(self, event):
+        self._hovered = False
+        self.update()
+        super().leaveEvent(event)
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self.clicked.emit(self.element)
+        super().mousePressEvent(event)
+
+    def paintEvent(self, event):
+        if ElementTile._NORMAL_PEN is None:
+            ElementTile._NORMAL_PEN = QPen(QColor(0, 0, 0, 25), 1)
+            ElementTile._HOVER_PEN = QPen(QColor('#0066CC'), 2)
+        elem = self.element
+        w, h = self.width(), self.height()
+        radius = self._radius
+        margin = self._margin
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        if self._hovered:
+            painter.setBrush(elem['_hover_bg'])
+            painter.setPen(ElementTile._HOVER_PEN)
+        else:
+            painter.setBrush(elem['_bg'])
+            painter.setPen(ElementTile._NORMAL_PEN)
+        painter.drawRoundedRect(1, 1, w - 2, h - 2, radius, radius)
+
+        painter.setPen(elem['_fg'])
+        if self.compact:
+            painter.setFont(_font(6, QFont.Weight.DemiBold))
+            painter.drawText(margin, margin, w - 2 * margin, 10,
+                             int(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop),
+                             str(elem['number']))
+            painter.setFont(_font(16, QFont.Weight.Bold))
+            painter.drawText(0, 0, w, h,
+                             int(Qt.AlignmentFlag.AlignCenter), elem['symbol'])
+        else:
+            painter.setFont(_font(9, QFont.Weight.DemiBold))
+            painter.drawText(margin, margin, w - 2 * margin, 14,
+                             int(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop),
+                             str(elem['number']))
+            painter.setFont(_font(28, QFont.Weight.Bold))
+            painter.drawText(0, 10, w, h - 34,
+                             int(Qt.AlignmentFlag.AlignCenter), elem['symbol'])
+            painter.setFont(_font(7))
+            painter.drawText(0, h - 25, w, 12,
+                             int(Qt.AlignmentFlag.AlignCenter), elem['name'])
+            painter.drawText(0, h - 14, w, 10,
+                             int(Qt.AlignmentFlag.AlignCenter), str(elem['atomic_mass']))
+
+
+class _Legend(QWidget):
+    """Color legend painted as a single widget.
+
+    Replaces ~40 nested container widgets and their stylesheets with
+    one paintEvent that draws the background panel, the rounded color
+    swatches and the group names directly.
+    """
+
+    _BG = None          # shared colors, built on first construction
+
+    def __init__(self, compact, parent=None):
+        super().__init__(parent)
+        if _Legend._BG is None:
+            _Legend._BG = QColor('#F8F9FA')
+            _Legend._BORDER = QColor('#DEE2E6')
+            _Legend._TEXT = QColor('#495057')
+            _Legend._SWATCH_BORDER = QColor(0, 0, 0, 25)
+        self._compact = compact
+        self._entries = tuple((QColor(GROUP_COLORS[group]), name)
+                              for group, name in GROUP_NAMES.items())
+        self._font = _font(8 if compact else 10)
+        self._swatch = 12 if compact else 16
+        self._gap = 4 if compact else 6            # swatch-to-text gap
+        self._spacing = 8 if compact else 16       # between items
+        self._margin = 8 if compact else 12
+        self._cols = 5 if compact else len(self._entries)
+
+        fm = QFontMetrics(self._font)
+        self._item_h = max(self._swatch, fm.height())
+        self._item_w = max(self._swatch + self._gap + fm.horizontalAdvance(name)
+                           for _, name in self._entries)
+        rows = -(-len(self._entries) // self._cols)
+        self._rows = rows
+        self.setFixedSize(
+            2 * self._margin + self._cols * self._item_w
+            + (self._cols - 1) * self._spacing,
+            2 * self._margin + rows * self._item_h + (rows - 1) * self._spacing)
+
+    def paintEvent(self, _event):
+        p = QPainter(self)
+        p.setRenderHint(QPainter.RenderHint.Antialiasing)
+        p.setBrush(self._BG)
+        p.setPen(QPen(self._BORDER, 1))
+        p.drawRoundedRect(0, 0, self.width() - 1, self.height() - 1, 6, 6)
+
+        p.setFont(self._font)
+        sw_radius = 2 if self._compact else 3
+        for i, (color, name) in enumerate(self._entries):
+            row, col = divmod(i, self._cols)
+            x = self._margin + col * (self._item_w + self._spacing)
+            y = self._margin + row * (self._item_h + self._spacing)
+            sy = y + (self._item_h - self._swatch) // 2
+            p.setBrush(color)
+            p.setPen(QPen(self._SWATCH_BORDER, 1))
+            p.drawRoundedRect(x, sy, self._swatch, self._swatch,
+                              sw_radius, sw_radius)
+            p.setPen(self._TEXT)
+            p.drawText(x + self._swatch + self._gap, y,
+                       self._item_w - self._swatch - self._gap, self._item_h,
+                       int(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter),
+                       name)
+
 
 class PeriodicTableDialog(QDialog):
     """Dialog for selecting elements from the periodic table"""
@@ -13,6 +414,7 @@ class PeriodicTableDialog(QDialog):
     def __init__(self, parent=None, compact=True, show_hover_info=True, bordered=False):
         super().__init__(parent)
         self.compact = compact
+        self._geom = _COMPACT_GEOM if compact else _FULL_GEOM
         self.show_hover_info = show_hover_info
         self.bordered = bordered
         self.setObjectName("periodicTableDialog")
@@ -26,9 +428,11 @@ class PeriodicTableDialog(QDialog):
             if show_hover_info:
                 height += 120  # Extra space for hover info
             self.resize(width, height)
-        else:
-            # Start in fullscreen mode for expanded version
-            self.showMaximized()
+
+        # Expanded version starts maximized; deferred to the first
+        # showEvent so __init__ doesn't trigger a show/layout pass on a
+        # dialog whose widget tree isn't built yet
+        self._start_maximized = not compact
         
         base_style = "background-color: white;"
         border_style = "border: 2px solid #000;" if self.bordered else ""
@@ -36,110 +440,77 @@ class PeriodicTableDialog(QDialog):
         
         # Load elements from JSON
         self.elements = self._load_elements()
-        
+
+        # tile button -> atomic number, used by the shared hover filter
+        self._btn_to_num = {}
+
+        # set by _create_hover_info once the panel's widgets exist
+        self._has_hover_ui = False
+
+        # throttle hover updates: sweeping the mouse across the table
+        # renders only the last element entered within the interval
+        self._pending_hover = None
+        self._hover_timer = QTimer(self)
+        self._hover_timer.setSingleShot(True)
+        self._hover_timer.setInterval(30)
+        self._hover_timer.timeout.connect(self._flush_hover)
+
         # Setup UI
         self._setup_ui()
         
     def _load_elements(self):
-        """Load elements from JSON file"""
-        json_path = os.path.join(os.path.dirname(__file__), 'PeriodicTableJSON.json')
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        return {elem['number']: elem for elem in data['elements']}
-    
-    def _get_element_group(self, element):
-        """Determine element group for color coding"""
-        category = element['category'].lower()
-        number = element['number']
-        
-        # Special case: Hydrogen is a nonmetal, not alkali metal
-        if number == 1:
-            return 'nonmetal'
-        
-        if 'alkali metal' in category and 'alkaline' not in category:
-            return 'alkali_metal'
-        elif 'alkaline earth' in category:
-            return 'alkaline_earth_metal'
-        elif 'lanthanide' in category:
-            return 'lanthanide'
-        elif 'actinide' in category:
-            return 'actinide'
-        elif 'transition metal' in category:
-            return 'transition_metal'
-        elif 'post-transition metal' in category:
-            return 'post_transition_metal'
-        elif 'metalloid' in category:
-            return 'metalloid'
-        elif 'noble gas' in category:
-            return 'noble_gas'
-        elif 'halogen' in category or number in [9, 17, 35, 53, 85]:
-            return 'halogen'
-        elif 'nonmetal' in category or 'diatomic nonmetal' in category:
-            return 'nonmetal'
-        else:
-            return 'unknown'
+        """Load elements from JSON file (parsed once and shared by all dialogs)"""
+        return _load_elements_cached(_JSON_PATH)
     
     def _setup_ui(self):
         """Setup the user interface"""
+        # suspend updates while ~150 widgets are added, so the layout
+        # and paint machinery runs once at the end instead of per add
+        self.setUpdatesEnabled(False)
+        try:
+            self._build_ui()
+        finally:
+            self.setUpdatesEnabled(True)
+
+    def _build_ui(self):
+        geom = self._geom
         main_layout = QVBoxLayout(self)
-        
-        if self.compact:
-            main_layout.setContentsMargins(12, 12, 12, 12)
-        else:
-            main_layout.setContentsMargins(20, 20, 20, 20)
-        
+
+        margin = geom.margin
+        main_layout.setContentsMargins(margin, margin, margin, margin)
+
         main_layout.setSpacing(0)
         
         # Main content (no scroll area for compact)
+        content_widget = QWidget()
+        content_layout = QVBoxLayout(content_widget)
+        content_layout.setSpacing(geom.section_spacing)
+        content_layout.setContentsMargins(0, 0, 0, 0)
+
+        # Main periodic table (with embedded hover info)
+        main_table = self._create_main_table()
+        content_layout.addWidget(main_table)
+
+        # Lanthanides and Actinides section
+        content_layout.addSpacing(geom.section_spacing)
+        series_section = self._create_series_section()
+        content_layout.addWidget(series_section)
+
+        # Legend at bottom
+        content_layout.addSpacing(geom.legend_spacing)
+        legend = self._create_legend()
+        content_layout.addWidget(legend, alignment=Qt.AlignmentFlag.AlignCenter)
+
         if self.compact:
-            content_widget = QWidget()
-            content_layout = QVBoxLayout(content_widget)
-            content_layout.setSpacing(8)
-            content_layout.setContentsMargins(0, 0, 0, 0)
-            
-            # Main periodic table (with embedded hover info)
-            main_table = self._create_main_table()
-            content_layout.addWidget(main_table)
-            
-            # Lanthanides and Actinides section
-            content_layout.addSpacing(8)
-            series_section = self._create_series_section()
-            content_layout.addWidget(series_section)
-            
-            # Legend at bottom
-            content_layout.addSpacing(8)
-            legend = self._create_legend()
-            content_layout.addWidget(legend, alignment=Qt.AlignmentFlag.AlignCenter)
-            
+            # No scroll area for compact: the dialog is sized to fit
             main_layout.addWidget(content_widget)
         else:
-            # Main content in scroll area for expanded
+            content_layout.addStretch()
+
             scroll = QScrollArea()
             scroll.setWidgetResizable(True)
             scroll.setFrameShape(QFrame.Shape.NoFrame)
             scroll.setStyleSheet("QScrollArea { border: none; background-color: white; }")
-            
-            content_widget = QWidget()
-            content_layout = QVBoxLayout(content_widget)
-            content_layout.setSpacing(16)
-            content_layout.setContentsMargins(0, 0, 0, 0)
-            
-            # Main periodic table (with embedded hover info)
-            main_table = self._create_main_table()
-            content_layout.addWidget(main_table)
-            
-            # Lanthanides and Actinides section
-            content_layout.addSpacing(16)
-            series_section = self._create_series_section()
-            content_layout.addWidget(series_section)
-            
-            # Legend at bottom
-            content_layout.addSpacing(12)
-            legend = self._create_legend()
-            content_layout.addWidget(legend, alignment=Qt.AlignmentFlag.AlignCenter)
-            
-            content_layout.addStretch()
-            
             scroll.setWidget(content_widget)
             main_layout.addWidget(scroll)
     
@@ -156,38 +527,35 @@ class PeriodicTableDialog(QDialog):
             }
         """)
         info_panel.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
-        info_panel.setMinimumHeight(120 if self.compact else 170)
+        geom = self._geom
+        info_panel.setMinimumHeight(geom.info_min_height)
         
         layout = QVBoxLayout(info_panel)
         layout.setContentsMargins(10, 8, 10, 8)
-        layout.setSpacing(8 if self.compact else 12)
-        
-        font_size_main = 12 if self.compact else 18
-        font_size_symbol = font_size_main + 4 if self.compact else font_size_main + 6
-        font_size_detail = 9 if self.compact else 10
+        layout.setSpacing(geom.info_spacing)
         
         main_layout = QHBoxLayout()
-        main_layout.setSpacing(12 if self.compact else 20)
+        main_layout.setSpacing(geom.info_header_spacing)
         
         self.info_number = QLabel("—")
-        self.info_number.setFont(QFont("Inter", font_size_main, QFont.Weight.Bold))
+        self.info_number.setFont(_font(geom.info_font, QFont.Weight.Bold))
         self.info_number.setStyleSheet("color: #111827; background-color: transparent;")
         self.info_number.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.info_number.setMinimumWidth(46 if self.compact else 56)
+        self.info_number.setMinimumWidth(geom.info_number_width)
         main_layout.addWidget(self.info_number)
         
         self.info_symbol = QLabel("—")
-        self.info_symbol.setFont(QFont("Inter", font_size_symbol, QFont.Weight.Bold))
+        self.info_symbol.setFont(_font(geom.info_symbol_font, QFont.Weight.Bold))
         self.info_symbol.setStyleSheet("color: #111827; background-color: transparent;")
         self.info_symbol.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.info_symbol.setMinimumWidth(72 if self.compact else 96)
+        self.info_symbol.setMinimumWidth(geom.info_symbol_width)
         main_layout.addWidget(self.info_symbol)
         
         self.info_name = QLabel("—")
-        self.info_name.setFont(QFont("Inter", font_size_main, QFont.Weight.Bold))
+        self.info_name.setFont(_font(geom.info_font, QFont.Weight.Bold))
         self.info_name.setStyleSheet("color: #111827; background-color: transparent;")
         self.info_name.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.info_name.setMinimumWidth(110 if self.compact else 160)
+        self.info_name.setMinimumWidth(geom.info_name_width)
         main_layout.addWidget(self.info_name)
         
         main_layout.addStretch()
@@ -195,226 +563,99 @@ class PeriodicTableDialog(QDialog):
         
         detail_grid = QGridLayout()
         detail_grid.setContentsMargins(0, 0, 0, 0)
-        detail_grid.setHorizontalSpacing(10 if self.compact else 16)
-        detail_grid.setVerticalSpacing(4 if self.compact else 6)
+        detail_grid.setHorizontalSpacing(geom.info_grid_hspacing)
+        detail_grid.setVerticalSpacing(geom.info_grid_vspacing)
         
-        detail_columns = 2 if self.compact else 3
-        self.info_labels = {}
+        detail_columns = geom.info_columns
+        info_fields = []
+        # all current fields are numeric in the element data
         info_items = [
-            ("atomic_mass", "Mass:", "amu"),
-            ("density", "Density:", "g/cm³"),
-            ("melt", "M.P.:", "K"),
-            ("boil", "B.P.:", "K"),
-            ("electron_affinity", "E.Aff.:", "kJ/mol"),
-            ("electronegativity_pauling", "E.neg.:", ""),
+            ("atomic_mass", "Mass:", "amu", True),
+            ("density", "Density:", "g/cm³", True),
+            ("melt", "M.P.:", "K", True),
+            ("boil", "B.P.:", "K", True),
+            ("electron_affinity", "E.Aff.:", "kJ/mol", True),
+            ("electronegativity_pauling", "E.neg.:", "", True),
         ]
-        
+
         row, col = 0, 0
-        for key, label_text, unit in info_items:
+        for key, label_text, unit, numeric in info_items:
             combined_label = QLabel(f"{label_text} —")
-            combined_label.setFont(QFont("Inter", font_size_detail))
+            combined_label.setFont(_font(geom.info_detail_font))
             combined_label.setStyleSheet("color: #111827; background-color: transparent;")
             combined_label.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
             combined_label.setWordWrap(False)
             combined_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
-            combined_label.setMinimumHeight(18 if self.compact else 22)
+            combined_label.setMinimumHeight(geom.info_row_height)
             detail_grid.addWidget(combined_label, row, col)
-            
-            self.info_labels[key] = (combined_label, label_text, unit)
-            
+
+            # pre-bind the label/unit formatting so hover updates don't
+            # re-derive them per field
+            info_fields.append((key, combined_label,
+                                _make_info_formatter(label_text, unit, numeric)))
+
             col += 1
             if col >= detail_columns:
                 col = 0
                 row += 1
-        
+
         layout.addLayout(detail_grid)
+        self._info_fields = tuple(info_fields)
+        self._has_hover_ui = True
         return info_panel
     
     def _update_hover_info(self, element):
         """Update hover info panel with element data"""
-        if not self.show_hover_info:
-            return
-        
-        # Check if hover info widgets exist
-        if not hasattr(self, 'info_number'):
-            return
-        if not hasattr(self, 'info_symbol'):
+        # one flag instead of four hasattr probes per hover event
+        if not self._has_hover_ui:
             return
-        if not hasattr(self, 'info_name'):
-            return
-        if not hasattr(self, 'info_labels'):
-            return
-        
+
         # Update main info (no labels)
         self.info_number.setText(str(element.get('number', '—')))
         self.info_symbol.setText(element.get('symbol', '—'))
         self.info_name.setText(element.get('name', '—'))
-        
+
         # Update additional info (format: "Label: Value Unit")
-        for key, (label_widget, label_text, unit) in self.info_labels.items():
-            value = element.get(key, "—")
-            if value is None or value == "":
-                text = f"{label_text} —"
-            else:
-                if isinstance(value, float):
-                    value_str = f"{value:.3f}"
-                else:
-                    value_str = str(value)
-                
-                if unit:
-                    text = f"{label_text} {value_str} {unit}"
-                else:
-                    text = f"{label_text} {value_str}"
-            
-            label_widget.setText(text)
+        for key, label_widget, fmt in self._info_fields:
+            label_widget.setText(fmt(element.get(key)))
     
     def _create_legend(self):
         """Create color legend (compact version at bottom)"""
-        legend_widget = QFrame()
-        legend_widget.setStyleSheet("""
-            QFrame {
-                background-color: #F8F9FA;
-                border: 1px solid #DEE2E6;
-                border-radius: 6px;
-                padding: 8px;
-            }
-        """)
-        
-        group_colors = self._get_group_colors()
-        group_names = {
-            'alkali_metal': 'Alkali',
-            'alkaline_earth_metal': 'Alk. Earth',
-            'transition_metal': 'Transition',
-            'post_transition_metal': 'Post-trans.',
-            'metalloid': 'Metalloid',
-            'nonmetal': 'Nonmetal',
-            'halogen': 'Halogen',
-            'noble_gas': 'Noble Gas',
-            'lanthanide': 'Lanthanide',
-            'actinide': 'Actinide'
-        }
-        
-        if self.compact:
-            # Grid layout for two rows in compact mode
-            grid_layout = QGridLayout(legend_widget)
-            grid_layout.setSpacing(8)
-            grid_layout.setContentsMargins(8, 8, 8, 8)
-            
-            row = 0
-            col = 0
-            for group, name in group_names.items():
-                item_layout = QHBoxLayout()
-                item_layout.setSpacing(4)
-                
-                color_box = QLabel()
-                color_box.setFixedSize(12, 12)
-                color_box.setStyleSheet(f"""
-                    background-color: {group_colors[group]};
-                    border-radius: 2px;
-                    border: 1px solid rgba(0, 0, 0, 0.1);
-                """)
-                
-                name_label = QLabel(name)
-                name_label.setFont(QFont("Inter", 8))
-                name_label.setStyleSheet("color: #495057; background-color: transparent; border: none;")
-                
-                item_layout.addWidget(color_box)
-                item_layout.addWidget(name_label)
-                
-                container = QWidget()
-                container.setLayout(item_layout)
-                container.setStyleSheet("background-color: transparent;")
-                
-                grid_layout.addWidget(container, row, col)
-                
-                col += 1
-                if col >= 5:  # 5 items per row
-                    col = 0
-                    row += 1
-        else:
-            # Single row layout for expanded mode
-            layout = QHBoxLayout(legend_widget)
-            layout.setSpacing(16)
-            layout.setContentsMargins(12, 8, 12, 8)
-            
-            for group, name in group_names.items():
-                item_layout = QHBoxLayout()
-                item_layout.setSpacing(6)
-                
-                color_box = QLabel()
-                color_box.setFixedSize(16, 16)
-                color_box.setStyleSheet(f"""
-                    background-color: {group_colors[group]};
-                    border-radius: 3px;
-                    border: 1px solid rgba(0, 0, 0, 0.1);
-                """)
-                
-                name_label = QLabel(name)
-                name_label.setFont(QFont("Inter", 10))
-                name_label.setStyleSheet("color: #495057; background-color: transparent; border: none;")
-                
-                item_layout.addWidget(color_box)
-                item_layout.addWidget(name_label)
-                
-                container = QWidget()
-                container.setLayout(item_layout)
-                container.setStyleSheet("background-color: transparent;")
-                
-                layout.addWidget(container)
-            
-            layout.addStretch()
-        
-        return legend_widget
+        return _Legend(self.compact)
     
     def _get_group_colors(self):
         """Get ACS-style color mapping"""
-        return {
-            'alkali_metal': '#F39C12',
-            'alkaline_earth_metal': '#F7DC6F',
-            'transition_metal': '#2E86C1',
-            'post_transition_metal': '#4D5B6A',
-            'metalloid': '#9A8F56',
-            'nonmetal': '#7ED3A6',
-            'halogen': '#E6F28C',
-            'noble_gas': '#8E6EC8',
-            'lanthanide': '#D98AD5',
-            'actinide': '#6CC3B1',
-            'unknown': '#E0E0E0'
-        }
+        return GROUP_COLORS
     
     def _create_main_table(self):
         """Create main periodic table"""
         table_widget = QWidget()
         table_widget.setStyleSheet("background-color: white;")
+        geom = self._geom
         layout = QGridLayout(table_widget)
-        spacing = 1 if self.compact else 6
-        layout.setSpacing(spacing)
+        layout.setSpacing(geom.grid_spacing)
         layout.setContentsMargins(0, 0, 0, 0)
         
         # Set horizontal and vertical spacing separately for better control
-        if self.compact:
-            layout.setHorizontalSpacing(1)
-            layout.setVerticalSpacing(1)
-        else:
-            layout.setHorizontalSpacing(6)
-            layout.setVerticalSpacing(6)
+        layout.setHorizontalSpacing(geom.grid_spacing)
+        layout.setVerticalSpacing(geom.grid_spacing)
         
         # Add group labels (1-18) at top
-        label_height = 12 if self.compact else 18
-        font_size = 7 if self.compact else 9
+        label_height = geom.axis_label_px
+        font_size = geom.axis_font
         for group in range(1, 19):
             label = QLabel(str(group))
-            label.setFont(QFont("Inter", font_size, QFont.Weight.DemiBold))
+            label.setFont(_font(font_size, QFont.Weight.DemiBold))
             label.setStyleSheet("color: #6C757D;")
             label.setAlignment(Qt.AlignmentFlag.AlignCenter)
             label.setFixedHeight(label_height)
             layout.addWidget(label, 0, group)
         
         # Add period labels (1-7) on left
-        label_width = 12 if self.compact else 18
+        label_width = geom.axis_label_px
         for period in range(1, 8):
             label = QLabel(str(period))
-            label.setFont(QFont("Inter", font_size, QFont.Weight.DemiBold))
+            label.setFont(_font(font_size, QFont.Weight.DemiBold))
             label.setStyleSheet("color: #6C757D;")
             label.setAlignment(Qt.AlignmentFlag.AlignCenter)
             label.setFixedWidth(label_width)
@@ -425,167 +666,64 @@ class PeriodicTableDialog(QDialog):
             self.hover_info = self._create_hover_info()
             layout.addWidget(self.hover_info, 1, 3, 3, 10)  # span 3 rows, 10 columns
         
-        # Create element tiles
-        group_colors = self._get_group_colors()
-        lanthanides = range(57, 72)
-        actinides = range(89, 104)
-        
-        for number, element in self.elements.items():
-            if number in lanthanides or number in actinides:
-                continue
-            
-            # Create placeholder for lanthanides/actinides
-            if element['period'] == 6 and element['group'] == 3:
-                placeholder = self._create_placeholder("57-71", group_colors['lanthanide'])
-                layout.addWidget(placeholder, 6, 3)
-                continue
-            elif element['period'] == 7 and element['group'] == 3:
-                placeholder = self._create_placeholder("89-103", group_colors['actinide'])
-                layout.addWidget(placeholder, 7, 3)
-                continue
-            
-            tile = self._create_element_tile(element)
-            layout.addWidget(tile, element['period'], element['group'])
-        
+        # Create element tiles from the precomputed placement
+        cells, placeholders, _ = _placement_cached(_JSON_PATH)
+        for prow, pcol, text, group in placeholders:
+            layout.addWidget(self._create_placeholder(text, GROUP_COLORS[group]),
+                             prow, pcol)
+        for prow, pcol, number in cells:
+            layout.addWidget(self._create_element_tile(self.elements[number]),
+                             prow, pcol)
+
         return table_widget
     
     def _create_placeholder(self, text, color):
         """Create placeholder for lanthanides/actinides"""
-        size = 40 if self.compact else 80
-        font_size = 7 if self.compact else 10
-        
-        placeholder = QLabel(text)
-        placeholder.setFixedSize(size, size)
-        placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        placeholder.setFont(QFont("Inter", font_size, QFont.Weight.Bold))
-        placeholder.setStyleSheet(f"""
-            background-color: {color};
-            color: white;
-            border-radius: {4 if self.compact else 8}px;
-            border: 1px solid rgba(0, 0, 0, 0.1);
-        """)
+        geom = self._geom
+
+        placeholder = QLabel()
+        placeholder.setFixedSize(geom.tile_size, geom.tile_size)
+        placeholder.setPixmap(_swatch_pixmap(text, color, geom.tile_size,
+                                             geom.tile_radius,
+                                             geom.placeholder_font))
         return placeholder
     
     def _create_element_tile(self, element):
-        """Create an element tile button"""
-        group = self._get_element_group(element)
-        color = self._get_group_colors()[group]
-        
-        # Determine text color based on background brightness
-        text_color = self._get_text_color(color)
-        
-        btn = QPushButton()
-        size = 40 if self.compact else 80
-        btn.setFixedSize(size, size)
-        btn.setCursor(Qt.CursorShape.PointingHandCursor)
-        
-        # Enable mouse tracking to ensure hover events work
-        btn.setMouseTracking(True)
-        
-        border_radius = 4 if self.compact else 8
-        btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {color};
-                border-radius: {border_radius}px;
-                border: 1px solid rgba(0, 0, 0, 0.1);
-                padding: 0px;
-            }}
-            QPushButton:hover {{
-                background-color: {self._lighten_color(color, 1.05)};
-                border: 2px solid #0066CC;
-            }}
-        """)
-        
-        # Create layout for tile content
-        layout = QVBoxLayout(btn)
-        margin = 3 if self.compact else 5
-        layout.setContentsMargins(margin, margin, margin, margin)
-        layout.setSpacing(0)
-        
-        if self.compact:
-            # Compact version - only symbol and number
-            # Atomic number (top left, small)
-            num_label = QLabel(str(element['number']))
-            num_label.setFont(QFont("Inter", 6, QFont.Weight.DemiBold))
-            num_label.setStyleSheet(f"color: {text_color}; background-color: transparent;")
-            num_label.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
-            layout.addWidget(num_label)
-            
-            # Symbol (dominant, centered)
-            symbol_label = QLabel(element['symbol'])
-            symbol_label.setFont(QFont("Inter", 16, QFont.Weight.Bold))
-            symbol_label.setStyleSheet(f"color: {text_color}; background-color: transparent;")
-            symbol_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            layout.addWidget(symbol_label, stretch=1, alignment=Qt.AlignmentFlag.AlignCenter)
-            
-        else:
-            # Full version - number, symbol, name, mass
-            # Atomic number
-            num_label = QLabel(str(element['number']))
-            num_label.setFont(QFont("Inter", 9, QFont.Weight.DemiBold))
-            num_label.setStyleSheet(f"color: {text_color}; background-color: transparent;")
-            num_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
-            layout.addWidget(num_label)
-            
-            # Symbol (dominant)
-            symbol_label = QLabel(element['symbol'])
-            symbol_label.setFont(QFont("Inter", 28, QFont.Weight.Bold))
-            symbol_label.setStyleSheet(f"color: {text_color}; background-color: transparent;")
-            symbol_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            layout.addWidget(symbol_label, stretch=1)
-            
-            # Name
-            name_label = QLabel(element['name'])
-            name_label.setFont(QFont("Inter", 7))
-            name_label.setStyleSheet(f"color: {text_color}; background-color: transparent;")
-            name_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            name_label.setWordWrap(False)
-            layout.addWidget(name_label)
-            
-            # Atomic mass
-            mass_label = QLabel(str(element['atomic_mass']))
-            mass_label.setFont(QFont("Inter", 7))
-            mass_label.setStyleSheet(f"color: {text_color}; background-color: transparent; opacity: 0.9;")
-            mass_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            layout.addWidget(mass_label)
-        
-        # Tooltip
-        btn.setToolTip(f"{element['name']}\nAtomic Number: {element['number']}\n"
-                      f"Atomic Mass: {element['atomic_mass']}\nCategory: {element['category']}")
-        
-        # Connect hover event - use a proper event override
-        def on_enter(event, elem=element):
-            self._update_hover_info(elem)
-            event.accept()
-        
-        btn.enterEvent = on_enter
-        btn.clicked.connect(lambda checked, e=element: self._on_element_clicked(e))
-        
-        return btn
+        """Create an element tile widget"""
+        tile = ElementTile(element, self.compact)
+
+        # Hover and tooltips go through one shared event filter instead
+        # of a per-tile enterEvent rebind and eagerly stored strings
+        self._btn_to_num[tile] = element['number']
+        tile.installEventFilter(self)
+        tile.clicked.connect(self._on_element_clicked)
+
+        return tile
     
     def _create_series_section(self):
         """Create lanthanides and actinides section"""
         series_widget = QWidget()
         series_widget.setStyleSheet("background-color: white;")
+        geom = self._geom
         layout = QVBoxLayout(series_widget)
-        spacing = 4 if self.compact else 8
-        layout.setSpacing(spacing)
+        layout.setSpacing(geom.series_spacing)
         layout.setContentsMargins(0, 0, 0, 0)
         
-        font_size = 8 if self.compact else 9
-        label_width = 60 if self.compact else 100
+        font_size = geom.series_font
+        label_width = geom.series_label_width
         
         # Lanthanides
         lan_layout = QHBoxLayout()
-        lan_layout.setSpacing(1 if self.compact else 6)
+        lan_layout.setSpacing(geom.grid_spacing)
         
         lan_label = QLabel("Lanthanides")
-        lan_label.setFont(QFont("Inter", font_size, QFont.Weight.Bold))
+        lan_label.setFont(_font(font_size, QFont.Weight.Bold))
         lan_label.setStyleSheet("color: #495057;")
         lan_label.setFixedWidth(label_width)
         lan_layout.addWidget(lan_label)
         
-        for number in range(57, 72):
+        lan_numbers, act_numbers = _placement_cached(_JSON_PATH)[2]
+        for number in lan_numbers:
             tile = self._create_element_tile(self.elements[number])
             lan_layout.addWidget(tile)
         
@@ -594,52 +732,58 @@ class PeriodicTableDialog(QDialog):
         
         # Actinides
         act_layout = QHBoxLayout()
-        act_layout.setSpacing(1 if self.compact else 6)
+        act_layout.setSpacing(geom.grid_spacing)
         
         act_label = QLabel("Actinides")
-        act_label.setFont(QFont("Inter", font_size, QFont.Weight.Bold))
+        act_label.setFont(_font(font_size, QFont.Weight.Bold))
         act_label.setStyleSheet("color: #495057;")
         act_label.setFixedWidth(label_width)
         act_layout.addWidget(act_label)
         
-        for number in range(89, 104):
-            if number in self.elements:
-                tile = self._create_element_tile(self.elements[number])
-                act_layout.addWidget(tile)
+        for number in act_numbers:
+            tile = self._create_element_tile(self.elements[number])
+            act_layout.addWidget(tile)
         
         act_layout.addStretch()
         layout.addLayout(act_layout)
         
         return series_widget
     
-    def _get_text_color(self, bg_color):
-        """Determine text color based on background brightness"""
-        color = QColor(bg_color)
-        r, g, b = color.red() / 255, color.green() / 255, color.blue() / 255
-        luminance = 0.299 * r + 0.587 * g + 0.114 * b
-        return "white" if luminance < 0.6 else "#212529"
-    
-    def _lighten_color(self, color, factor):
-        """Lighten a color by a factor"""
-        qcolor = QColor(color)
-        h, s, l, a = qcolor.getHslF()
-        l = min(1.0, l * factor)
-        qcolor.setHslF(h, s, l, a)
-        return qcolor.name()
-    
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Enter:
+            num = self._btn_to_num.get(obj)
+            if num is not None:
+                self._pending_hover = self.elements[num]
+                self._hover_timer.start()
+        elif event.type() == QEvent.Type.ToolTip:
+            # tooltip text is formatted only when the user actually
+            # pauses on a tile, not stored for all ~118 of them
+            num = self._btn_to_num.get(obj)
+            if num is not None:
+                elem = self.elements[num]
+                QToolTip.showText(
+                    event.globalPos(),
+                    f"{elem['name']}\nAtomic Number: {elem['number']}\n"
+                    f"Atomic Mass: {elem['atomic_mass']}\nCategory: {elem['category']}",
+                    obj)
+                return True
+        return super().eventFilter(obj, event)
+
+    def _flush_hover(self):
+        if self._pending_hover is not None:
+            self._update_hover_info(self._pending_hover)
+            self._pending_hover = None
+
     def _on_element_clicked(self, element):
         """Handle element button click"""
         self.element_selected.emit(element)
         self.accept()
-    
-    def paintEvent(self, event):
-        super().paintEvent(event)
-        if self.bordered:
-            painter = QPainter(self)
-            pen = QPen(Qt.GlobalColor.black)
-            pen.setWidth(2)
-            painter.setPen(pen)
-            painter.drawRect(self.rect().adjusted(1, 1, -1, -1))
+
+    def showEvent(self, event):
+        if self._start_maximized:
+            self._start_maximized = False
+            self.showMaximized()
+        super().showEvent(event)
 
 
 class PeriodicTableButton(QPushButton):
@@ -653,13 +797,15 @@ class PeriodicTableButton(QPushButton):
         self.show_hover_info = show_hover_info
         self.bordered = bordered
         self.update_button_text = update_button_text
+        self._dialog = None
         self.clicked.connect(self._open_periodic_table)
-        
+
     def _open_periodic_table(self):
-        """Open periodic table dialog"""
-        dialog = PeriodicTableDialog(self, compact=self.compact, show_hover_info=self.show_hover_info, bordered=self.bordered)
-        dialog.element_selected.connect(self._on_element_selected)
-        dialog.exec()
+        """Open periodic table dialog (built once, reused per click)"""
+        if self._dialog is None:
+            self._dialog = PeriodicTableDialog(self, compact=self.compact, show_hover_info=self.show_hover_info, bordered=self.bordered)
+            self._dialog.element_selected.connect(self._on_element_selected)
+        self._dialog.exec()
     
     def _on_element_selected(self, element):
         """Store and emit selected element"""
@@ -6,11 +6,17 @@ class ToggleSwitch(QtWidgets.QWidget):
     """Ein einfacher, klickbarer Toggle-Switch ohne Animation."""
     toggled = QtCore.pyqtSignal(bool)
 
+    # shared colors: one set per process instead of per repaint
+    _BG_ON = QtGui.QColor(0, 150, 136)
+    _BG_OFF = QtGui.QColor(160, 160, 160)
+    _KNOB = QtGui.QColor(255, 255, 255)
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self._checked = False
         self.setCursor(Qt.CursorShape.PointingHandCursor)
         self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        self._update_geometry()
 
     def sizeHint(self) -> QtCore.QSize:
         return QtCore.QSize(50, 26)
@@ -47,23 +53,28 @@ class ToggleSwitch(QtWidgets.QWidget):
             return
         super().keyPressEvent(event)
 
-    def paintEvent(self, _event):
+    def _update_geometry(self):
+        # geometry only changes on resize, so the rects are computed
+        # there and paintEvent just picks by state
         radius = self.height() / 2
-        knob_radius = radius - 3
+        knob_diameter = max(0.0, (radius - 3) * 2)
+        self._radius = radius
+        self._bg_rect = QtCore.QRect(0, 0, self.width(), self.height())
+        self._knob_rect_off = QtCore.QRectF(3, 3, knob_diameter, knob_diameter)
+        self._knob_rect_on = QtCore.QRectF(self.width() - knob_diameter - 3, 3,
+                                           knob_diameter, knob_diameter)
+
+    def resizeEvent(self, event):
+        self._update_geometry()
+        super().resizeEvent(event)
+
+    def paintEvent(self, _event):
         p = QtGui.QPainter(self)
         p.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
 
-        bg_color = QtGui.QColor(0, 150, 136) if self._checked else QtGui.QColor(160, 160, 160)
-        p.setBrush(bg_color)
+        p.setBrush(self._BG_ON if self._checked else self._BG_OFF)
         p.setPen(QtCore.Qt.PenStyle.NoPen)
+        p.drawRoundedRect(self._bg_rect, self._radius, self._radius)
 
-        rect = QtCore.QRect(0, 0, self.width(), self.height())
-        p.drawRoundedRect(rect, radius, radius)
-
-        x_left = 3
-        x_right = self.width() - (knob_radius * 2) - 3
-        x = x_right if self._checked else x_left
-        knob_rect = QtCore.QRectF(x, 3, knob_radius * 2, knob_radius * 2)
-
-        p.setBrush(QtGui.QColor(255, 255, 255))
-        p.drawEllipse(knob_rect)
+        p.setBrush(self._KNOB)
+        p.drawEllipse(self._knob_rect_on if self._checked else self._knob_rect_off)